@@ -1,62 +1,382 @@
 """Database helper module.
 
-Provides get_connection() which returns a sqlite3 connection to data.db
-and ensures the database schema is initialized from schema.sql on each
-connection. Also includes helper insert, update, and lookup functions for
-the `events`, `teams`, `wrestlers`, and `matches` tables.
+Provides get_connection() which returns a pooled sqlite3 connection to
+data.db and ensures the database schema is initialized from schema.sql once
+per process. Connections can be handed back with return_connection() or
+borrowed for a block with ``with connection() as conn:``. Ingestion hands
+its writes to the single writer thread with submit_write()/run_write(),
+which runs each one inside ``with transaction(conn):`` on a connection from
+get_write_connection(). Also includes helper insert, update, and lookup
+functions for the `events`, `teams`, `wrestlers`, and `matches` tables.
 """
 import os
+import queue
 import sqlite3
-from typing import Optional, Tuple
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
 
 BASE_DIR = os.path.dirname(__file__)
 DB_PATH = os.path.join(BASE_DIR, "data.db")
 SCHEMA_PATH = os.path.join(BASE_DIR, "schema.sql")
 
 
+def _read_schema() -> Optional[str]:
+    if not os.path.exists(SCHEMA_PATH):
+        return None
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+SCHEMA_SQL = _read_schema()
+
+_initialized = False
+_init_lock = threading.Lock()
+
+_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+
 def _init_db(conn: sqlite3.Connection) -> None:
     """Initialize database schema from `schema.sql`.
 
-    This runs every time get_connection() is called so the tables exist.
+    The schema script and column migrations only run the first time a
+    connection is opened in this process; later calls return immediately.
     """
-    if not os.path.exists(SCHEMA_PATH):
-        # Nothing to do if schema file is missing — raise a clear error
-        raise FileNotFoundError(f"schema.sql not found at {SCHEMA_PATH}")
-    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
-        sql = f.read()
-    conn.executescript(sql)
-
-    # Backfill crawled flag for teams table if the column does not exist yet.
-    cur = conn.execute("PRAGMA table_info(teams)")
-    columns = {row[1] if not isinstance(row, sqlite3.Row) else row["name"] for row in cur.fetchall()}
-    if "crawled" not in columns:
-        conn.execute("ALTER TABLE teams ADD COLUMN crawled INTEGER DEFAULT 0")
-        conn.commit()
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        if SCHEMA_SQL is None:
+            # Nothing to do if schema file is missing — raise a clear error
+            raise FileNotFoundError(f"schema.sql not found at {SCHEMA_PATH}")
+        conn.executescript(SCHEMA_SQL)
+
+        # Backfill crawled flag for teams table if the column does not exist yet.
+        cur = conn.execute("PRAGMA table_info(teams)")
+        columns = {row[1] if not isinstance(row, sqlite3.Row) else row["name"] for row in cur.fetchall()}
+        if "crawled" not in columns:
+            conn.execute("ALTER TABLE teams ADD COLUMN crawled INTEGER DEFAULT 0")
+            conn.commit()
+
+        # Backfill the postseason flag for events stored before it existed.
+        cur = conn.execute("PRAGMA table_info(events)")
+        columns = {row[1] if not isinstance(row, sqlite3.Row) else row["name"] for row in cur.fetchall()}
+        if "is_postseason" not in columns:
+            conn.execute("ALTER TABLE events ADD COLUMN is_postseason INTEGER DEFAULT 0")
+            conn.execute("UPDATE events SET is_postseason = 1 WHERE name LIKE '%MIAA%'")
+            conn.commit()
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_events_postseason ON events(is_postseason) WHERE is_postseason = 1"
+        )
+        _initialized = True
 
 
-def get_connection() -> sqlite3.Connection:
-    """Return a sqlite3.Connection to `data.db`, initializing schema.
+_INSERT_EVENT_SQL = (
+    "INSERT INTO events (id, date, state, name, isDual, lat, lon, is_postseason) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO NOTHING"
+)
+
+_INSERT_TEAM_SQL = (
+    "INSERT INTO teams (id, name, state, crawled) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(id) DO NOTHING"
+)
+
+_UPSERT_WRESTLER_SQL = (
+    "INSERT INTO wrestlers (id, name, state, gradYear, dateOfBirth, teamId) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    "name = COALESCE(excluded.name, name), "
+    "state = COALESCE(excluded.state, state), "
+    "gradYear = COALESCE(gradYear, excluded.gradYear), "
+    "dateOfBirth = COALESCE(excluded.dateOfBirth, dateOfBirth), "
+    "teamId = COALESCE(excluded.teamId, teamId)"
+)
+
+# Same as above, but a provided gradYear replaces the stored one.
+_UPSERT_WRESTLER_OVERWRITE_GRAD_SQL = _UPSERT_WRESTLER_SQL.replace(
+    "gradYear = COALESCE(gradYear, excluded.gradYear)",
+    "gradYear = COALESCE(excluded.gradYear, gradYear)",
+)
+
+_INSERT_MATCH_SQL = (
+    "INSERT INTO matches (id, topId, bottomId, winnerId, result, winType, eventId, weightClass, date) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO NOTHING"
+)
+
+
+# Recently seen ids known to be committed, per table, least recently used
+# first and capped at ID_CACHE_SIZE each. Filled by *_exists()/existing_ids()
+# lookups and by the create/upsert helpers once their rows are committed.
+# Rows are never deleted, so a cached id stays valid; an id missing from the
+# cache is simply looked up in the database.
+ID_CACHE_SIZE = 10000
+_id_cache: "dict[str, OrderedDict[str, None]]" = {}
+
+# Ids written with commit=False, keyed by id(conn), until the connection's
+# transaction commits (moved into _id_cache) or rolls back (dropped).
+_pending_ids: dict[int, dict[str, set[str]]] = {}
+_id_lock = threading.Lock()
+
+
+def _cache_ids(table: str, ids: Iterable[str]) -> None:
+    # Callers hold _id_lock.
+    cached = _id_cache.setdefault(table, OrderedDict())
+    for row_id in ids:
+        cached[row_id] = None
+        cached.move_to_end(row_id)
+    while len(cached) > ID_CACHE_SIZE:
+        cached.popitem(last=False)
+
+
+def _remember_ids(conn: sqlite3.Connection, table: str, ids: Iterable[str], committed: bool) -> None:
+    with _id_lock:
+        if committed:
+            _cache_ids(table, ids)
+        else:
+            _pending_ids.setdefault(id(conn), {}).setdefault(table, set()).update(ids)
+
+
+def _commit_pending_ids(conn: sqlite3.Connection) -> None:
+    with _id_lock:
+        for table, ids in _pending_ids.pop(id(conn), {}).items():
+            _cache_ids(table, ids)
+
+
+def _discard_pending_ids(conn: sqlite3.Connection) -> None:
+    with _id_lock:
+        _pending_ids.pop(id(conn), None)
 
-    The schema from `schema.sql` is executed on every call to ensure
-    tables exist. The connection uses Row factory for convenient access.
+
+def clear_id_cache() -> None:
+    """Forget cached ids so later *_exists() calls query the database again."""
+    with _id_lock:
+        _id_cache.clear()
+
+
+# Stay well under SQLite's host-parameter limit when building IN lists.
+_IN_CHUNK = 500
+
+
+def existing_ids(conn: sqlite3.Connection, table: str, ids: Iterable[str]) -> set[str]:
+    """Return the subset of `ids` already stored in `table`.
+
+    Ids already in the id cache are answered from it; the rest are looked up
+    with one ``SELECT id ... WHERE id IN (...)`` per chunk, without pulling
+    the whole table into memory. Ids found are cached, or staged until commit
+    when `conn` has a transaction open, since they may be its own writes.
     """
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    wanted = set(ids)
+    with _id_lock:
+        cached = _id_cache.get(table)
+        found = wanted.intersection(cached) if cached else set()
+        for row_id in found:
+            cached.move_to_end(row_id)  # type: ignore[union-attr]
+    pending = list(wanted - found)
+    if not pending:
+        return found
+    fetched: set[str] = set()
+    for start in range(0, len(pending), _IN_CHUNK):
+        chunk = pending[start:start + _IN_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        cur = conn.execute(f"SELECT id FROM {table} WHERE id IN ({placeholders})", chunk)
+        fetched.update(row[0] for row in cur)
+    if fetched:
+        _remember_ids(conn, table, fetched, committed=not conn.in_transaction)
+    return found | fetched
+
+
+def _open_connection(write: bool = False, shared: bool = True) -> sqlite3.Connection:
+    # Connections that may be handed between threads skip sqlite3's
+    # same-thread check; pass shared=False for one a single thread keeps.
+    if write:
+        # Autocommit mode with no type detection or row factory: writers issue
+        # explicit BEGIN/COMMIT through transaction() and never read rows back.
+        conn = sqlite3.connect(DB_PATH, check_same_thread=not shared, detect_types=0, isolation_level=None)
+    else:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=not shared)
+        conn.row_factory = sqlite3.Row
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     _init_db(conn)
     return conn
 
 
-def _build_set_clause(fields: dict) -> Tuple[str, list]:
-    """Helper to build SET clause and parameters for an UPDATE statement.
+def get_connection() -> sqlite3.Connection:
+    """Return a sqlite3.Connection to `data.db`, initializing schema.
+
+    Connections are reused from a pool when one has been returned with
+    return_connection(); otherwise a new, tuned connection is opened. The
+    schema from `schema.sql` is executed on the first call only. The
+    connection uses Row factory for convenient access.
+    """
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return _open_connection()
+
+
+def get_write_connection() -> sqlite3.Connection:
+    """Open an autocommit connection meant for bulk inserts.
+
+    Unlike get_connection() it has no row factory and no implicit
+    transactions; wrap writes in ``with transaction(conn):``. It is not
+    pooled: the writer thread opens one and keeps it.
+    """
+    return _open_connection(write=True)
+
+
+def return_connection(conn: sqlite3.Connection) -> None:
+    """Hand a connection from get_connection() back to the pool.
+
+    Uncommitted work is rolled back, along with any ids it had staged for the
+    id cache.
+    """
+    _discard_pending_ids(conn)
+    if conn.in_transaction:
+        conn.rollback()
+    _pool.put(conn)
+
+
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled connection for the duration of a ``with`` block."""
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        return_connection(conn)
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run the block in one explicit transaction, committing on success.
+
+    The write lock is taken up front (BEGIN IMMEDIATE) so a busy database
+    fails at the start of the block rather than midway through. Ids written
+    inside the block reach the id cache only once the commit succeeds; on
+    error the transaction is rolled back and they are dropped.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        _discard_pending_ids(conn)
+        conn.rollback()
+        raise
+    try:
+        conn.commit()
+    except BaseException:
+        _discard_pending_ids(conn)
+        raise
+    _commit_pending_ids(conn)
+
+
+# Single background thread that owns one write connection. Work submitted
+# with submit_write()/run_write() runs there, one transaction per callable,
+# so concurrent producers never contend for SQLite's write lock.
+_writer_queue: "queue.Queue[Tuple[Callable[[sqlite3.Connection], Any], Future]]" = queue.Queue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+# Seconds run_write() waits for its work before giving up.
+WRITE_TIMEOUT = 300.0
+
+
+def _writer_loop(conn: sqlite3.Connection) -> None:
+    while True:
+        work, future = _writer_queue.get()
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            with transaction(conn):
+                result = work(conn)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+
+def _ensure_writer() -> None:
+    global _writer_thread
+    if _writer_thread is not None and _writer_thread.is_alive():
+        return
+    with _writer_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            # Open the connection here so a locked or unwritable database
+            # fails in the caller instead of silently killing the thread.
+            conn = get_write_connection()
+            thread = threading.Thread(target=_writer_loop, args=(conn,), name="db-writer", daemon=True)
+            thread.start()
+            _writer_thread = thread
+
+
+def submit_write(work: Callable[[sqlite3.Connection], Any]) -> Future:
+    """Queue `work(conn)` to run in one transaction on the writer thread.
+
+    The writer thread is started on first use, and restarted if it has died;
+    an error opening its connection is raised here. Returns a Future
+    resolving to the callable's return value (or its exception).
+    """
+    _ensure_writer()
+    future: Future = Future()
+    _writer_queue.put((work, future))
+    return future
+
+
+def run_write(work: Callable[[sqlite3.Connection], Any], timeout: Optional[float] = WRITE_TIMEOUT) -> Any:
+    """Like submit_write(), but wait for the work to finish and return its result.
 
-    Returns tuple (set_clause, params)
+    Raises concurrent.futures.TimeoutError if the writer has not finished the
+    work within `timeout` seconds (None waits forever); work that has not
+    started yet is cancelled so it will not run later.
     """
-    parts = []
-    params = []
-    for k, v in fields.items():
-        parts.append(f"{k} = ?")
-        params.append(v)
-    return ", ".join(parts), params
+    future = submit_write(work)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
+
+@lru_cache(maxsize=None)
+def _update_sql(table: str, columns: Tuple[str, ...]) -> str:
+    """Return the UPDATE statement for `table` setting `columns` by id.
+
+    Cached so every call with the same column set reuses identical SQL text,
+    which lets sqlite3's statement cache skip re-preparing it.
+    """
+    set_clause = ", ".join(f"{column} = ?" for column in columns)
+    return f"UPDATE {table} SET {set_clause} WHERE id = ?"
+
+
+def _build_update(table: str, fields: dict, row_id: str) -> Tuple[str, list]:
+    """Helper to build an UPDATE statement and parameters for one row.
+
+    Returns tuple (sql, params)
+    """
+    columns = tuple(sorted(fields))
+    params = [fields[column] for column in columns]
+    params.append(row_id)
+    return _update_sql(table, columns), params
+
+
+def _is_postseason(name: Optional[str]) -> int:
+    """MIAA tournaments are the postseason; mirrors ``name LIKE '%MIAA%'``."""
+    return int(name is not None and "MIAA" in name.upper())
 
 
 def _bool_to_int(value: Optional[bool]) -> Optional[int]:
@@ -69,49 +389,109 @@ def _bool_to_int(value: Optional[bool]) -> Optional[int]:
 def create_event(conn: sqlite3.Connection, *, event_id: str, date: Optional[str] = None,
                  state: Optional[str] = None, name: Optional[str] = None,
                  isDual: Optional[bool] = None, lat: Optional[float] = None,
-                 lon: Optional[float] = None) -> str:
-    """Insert a new row into `events`. Returns the event_id."""
+                 lon: Optional[float] = None, commit: bool = True) -> str:
+    """Insert a new row into `events`. Returns the event_id.
+
+    An existing row with the same id is left untouched. Pass
+    ``commit=False`` to leave the insert in the caller's transaction.
+    """
     cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO events (id, date, state, name, isDual, lat, lon) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (event_id, date, state, name, _bool_to_int(isDual), lat, lon),
-    )
-    conn.commit()
+    cur.execute(_INSERT_EVENT_SQL, (event_id, date, state, name, _bool_to_int(isDual), lat, lon, _is_postseason(name)))
+    if commit:
+        conn.commit()
+    _remember_ids(conn, "events", (event_id,), committed=commit)
     return event_id
 
 
+def create_events(conn: sqlite3.Connection, rows: Iterable[Tuple], commit: bool = True) -> None:
+    """Insert many `events` rows, skipping ids that already exist.
+
+    Each row is ``(id, date, state, name, isDual, lat, lon)`` with isDual
+    already converted to 1/0/None. The postseason flag is derived from name.
+    """
+    rows = [(*row, _is_postseason(row[3])) for row in rows]
+    conn.executemany(_INSERT_EVENT_SQL, rows)
+    if commit:
+        conn.commit()
+    _remember_ids(conn, "events", (row[0] for row in rows), committed=commit)
+
+
 def create_team(conn: sqlite3.Connection, *, team_id: str, name: Optional[str] = None,
-                state: Optional[str] = None, crawled: Optional[bool] = None) -> str:
-    """Insert a new row into `teams`. Returns the team_id."""
+                state: Optional[str] = None, crawled: Optional[bool] = None, commit: bool = True) -> str:
+    """Insert a new row into `teams` unless it exists. Returns the team_id."""
     cur = conn.cursor()
     crawled_value = _bool_to_int(crawled) if crawled is not None else 0
-    cur.execute(
-        "INSERT INTO teams (id, name, state, crawled) VALUES (?, ?, ?, ?)",
-        (team_id, name, state, crawled_value),
-    )
-    conn.commit()
+    cur.execute(_INSERT_TEAM_SQL, (team_id, name, state, crawled_value))
+    if commit:
+        conn.commit()
+    _remember_ids(conn, "teams", (team_id,), committed=commit)
     return team_id
 
 
+def create_teams(conn: sqlite3.Connection, rows: Iterable[Tuple], commit: bool = True) -> None:
+    """Insert many `teams` rows, skipping ids that already exist.
+
+    Each row is ``(id, name, state, crawled)``.
+    """
+    rows = list(rows)
+    conn.executemany(_INSERT_TEAM_SQL, rows)
+    if commit:
+        conn.commit()
+    _remember_ids(conn, "teams", (row[0] for row in rows), committed=commit)
+
+
 def create_wrestler(conn: sqlite3.Connection, *, wrestler_id: str, name: Optional[str] = None,
                     state: Optional[str] = None, gradYear: Optional[int] = None,
-                    dateOfBirth: Optional[str] = None, teamId: Optional[str] = None) -> str:
-    """Insert a new row into `wrestlers`. Returns the wrestler_id."""
+                    dateOfBirth: Optional[str] = None, teamId: Optional[str] = None, commit: bool = True) -> str:
+    """Insert a new row into `wrestlers` unless it exists. Returns the wrestler_id."""
     cur = conn.cursor()
     cur.execute(
         "INSERT INTO wrestlers (id, name, state, gradYear, dateOfBirth, teamId) "
-        "VALUES (?, ?, ?, ?, ?, ?)",
+        "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO NOTHING",
         (wrestler_id, name, state, gradYear, dateOfBirth, teamId),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
+    _remember_ids(conn, "wrestlers", (wrestler_id,), committed=commit)
+    return wrestler_id
+
+
+def upsert_wrestler(conn: sqlite3.Connection, *, wrestler_id: str, name: Optional[str] = None,
+                    state: Optional[str] = None, gradYear: Optional[int] = None,
+                    dateOfBirth: Optional[str] = None, teamId: Optional[str] = None,
+                    overwrite_grad_year: bool = False, commit: bool = True) -> str:
+    """Insert a wrestler or merge into the existing row in one statement.
+
+    On conflict, provided (non-None) name/state/dateOfBirth/teamId overwrite
+    the stored values, while gradYear is only filled in when still missing
+    unless ``overwrite_grad_year`` is set. Returns the wrestler_id.
+    """
+    sql = _UPSERT_WRESTLER_OVERWRITE_GRAD_SQL if overwrite_grad_year else _UPSERT_WRESTLER_SQL
+    cur = conn.cursor()
+    cur.execute(sql, (wrestler_id, name, state, gradYear, dateOfBirth, teamId))
+    if commit:
+        conn.commit()
+    _remember_ids(conn, "wrestlers", (wrestler_id,), committed=commit)
     return wrestler_id
 
 
+def upsert_wrestlers(conn: sqlite3.Connection, rows: Iterable[Tuple],
+                     overwrite_grad_year: bool = False, commit: bool = True) -> None:
+    """Upsert many `wrestlers` rows with the same merge rules as upsert_wrestler.
+
+    Each row is ``(id, name, state, gradYear, dateOfBirth, teamId)``.
+    """
+    rows = list(rows)
+    sql = _UPSERT_WRESTLER_OVERWRITE_GRAD_SQL if overwrite_grad_year else _UPSERT_WRESTLER_SQL
+    conn.executemany(sql, rows)
+    if commit:
+        conn.commit()
+    _remember_ids(conn, "wrestlers", (row[0] for row in rows), committed=commit)
+
+
 def wrestler_exists(conn: sqlite3.Connection, wrestler_id: str) -> bool:
     """Return True if a wrestler with `wrestler_id` exists."""
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM wrestlers WHERE id = ? LIMIT 1", (wrestler_id,))
-    return cur.fetchone() is not None
+    return bool(existing_ids(conn, "wrestlers", (wrestler_id,)))
 
 
 def get_wrestler(conn: sqlite3.Connection, wrestler_id: str) -> Optional[sqlite3.Row]:
@@ -126,16 +506,12 @@ def get_wrestler(conn: sqlite3.Connection, wrestler_id: str) -> Optional[sqlite3
 
 def event_exists(conn: sqlite3.Connection, event_id: str) -> bool:
     """Return True if an event with `event_id` exists."""
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM events WHERE id = ? LIMIT 1", (event_id,))
-    return cur.fetchone() is not None
+    return bool(existing_ids(conn, "events", (event_id,)))
 
 
 def team_exists(conn: sqlite3.Connection, team_id: str) -> bool:
     """Return True if a team with `team_id` exists."""
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM teams WHERE id = ? LIMIT 1", (team_id,))
-    return cur.fetchone() is not None
+    return bool(existing_ids(conn, "teams", (team_id,)))
 
 
 def is_team_crawled(conn: sqlite3.Connection, team_id: str) -> bool:
@@ -156,30 +532,42 @@ def set_team_crawled(conn: sqlite3.Connection, team_id: str, crawled: bool = Tru
 
 def match_exists(conn: sqlite3.Connection, match_id: str) -> bool:
     """Return True if a match with `match_id` exists."""
-    cur = conn.cursor()
-    cur.execute("SELECT 1 FROM matches WHERE id = ? LIMIT 1", (match_id,))
-    return cur.fetchone() is not None
+    return bool(existing_ids(conn, "matches", (match_id,)))
 
 
 def create_match(conn: sqlite3.Connection, *, match_id: str, topId: Optional[str] = None,
                  bottomId: Optional[str] = None, winnerId: Optional[str] = None,
                  result: Optional[str] = None, winType: Optional[str] = None,
-                 eventId: Optional[str] = None, weightClass: Optional[str] = None, date: Optional[str] = None) -> str:
-    """Insert a new row into `matches`. Returns the match_id."""
+                 eventId: Optional[str] = None, weightClass: Optional[str] = None, date: Optional[str] = None, commit: bool = True) -> str:
+    """Insert a new row into `matches` unless it exists. Returns the match_id."""
     cur = conn.cursor()
     cur.execute(
-        "INSERT INTO matches (id, topId, bottomId, winnerId, result, winType, eventId, weightClass, date) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        _INSERT_MATCH_SQL,
         (match_id, topId, bottomId, winnerId, result, winType, eventId, weightClass, date),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
+    _remember_ids(conn, "matches", (match_id,), committed=commit)
     return match_id
 
 
+def create_matches(conn: sqlite3.Connection, rows: Iterable[Tuple], commit: bool = True) -> None:
+    """Insert many `matches` rows, skipping ids that already exist.
+
+    Each row is ``(id, topId, bottomId, winnerId, result, winType, eventId,
+    weightClass, date)``.
+    """
+    rows = list(rows)
+    conn.executemany(_INSERT_MATCH_SQL, rows)
+    if commit:
+        conn.commit()
+    _remember_ids(conn, "matches", (row[0] for row in rows), committed=commit)
+
+
 def update_event(conn: sqlite3.Connection, event_id: str, *, date: Optional[str] = None,
                  state: Optional[str] = None, name: Optional[str] = None,
                  isDual: Optional[bool] = None, lat: Optional[float] = None,
-                 lon: Optional[float] = None) -> int:
+                 lon: Optional[float] = None, commit: bool = True) -> int:
     """Update fields on the `events` table for the given event_id.
 
     Only fields provided (not None) are updated. Returns number of rows updated.
@@ -191,6 +579,7 @@ def update_event(conn: sqlite3.Connection, event_id: str, *, date: Optional[str]
         fields["state"] = state
     if name is not None:
         fields["name"] = name
+        fields["is_postseason"] = _is_postseason(name)
     if isDual is not None:
         # store boolean as integer 0/1
         fields["isDual"] = _bool_to_int(isDual)
@@ -202,16 +591,16 @@ def update_event(conn: sqlite3.Connection, event_id: str, *, date: Optional[str]
     if not fields:
         return 0
 
-    set_clause, params = _build_set_clause(fields)
-    params.append(event_id)
+    sql, params = _build_update("events", fields, event_id)
     cur = conn.cursor()
-    cur.execute(f"UPDATE events SET {set_clause} WHERE id = ?", params)
-    conn.commit()
+    cur.execute(sql, params)
+    if commit:
+        conn.commit()
     return cur.rowcount
 
 
 def update_team(conn: sqlite3.Connection, team_id: str, *, name: Optional[str] = None,
-                state: Optional[str] = None, crawled: Optional[bool] = None) -> int:
+                state: Optional[str] = None, crawled: Optional[bool] = None, commit: bool = True) -> int:
     """Update fields on the `teams` table for the given team_id."""
     fields = {}
     if name is not None:
@@ -224,18 +613,18 @@ def update_team(conn: sqlite3.Connection, team_id: str, *, name: Optional[str] =
     if not fields:
         return 0
 
-    set_clause, params = _build_set_clause(fields)
-    params.append(team_id)
+    sql, params = _build_update("teams", fields, team_id)
     cur = conn.cursor()
-    cur.execute(f"UPDATE teams SET {set_clause} WHERE id = ?", params)
-    conn.commit()
+    cur.execute(sql, params)
+    if commit:
+        conn.commit()
     return cur.rowcount
 
 
 def update_wrestler(conn: sqlite3.Connection, wrestler_id: str, *,
                     gradYear: Optional[int] = None, dateOfBirth: Optional[str] = None,
                     teamId: Optional[str] = None, name: Optional[str] = None,
-                    state: Optional[str] = None) -> int:
+                    state: Optional[str] = None, commit: bool = True) -> int:
     """Update fields on the `wrestlers` table for the given wrestler_id.
 
     Only fields provided (not None) are updated. Returns number of rows updated.
@@ -255,18 +644,26 @@ def update_wrestler(conn: sqlite3.Connection, wrestler_id: str, *,
     if not fields:
         return 0
 
-    set_clause, params = _build_set_clause(fields)
-    params.append(wrestler_id)
+    sql, params = _build_update("wrestlers", fields, wrestler_id)
     cur = conn.cursor()
-    cur.execute(f"UPDATE wrestlers SET {set_clause} WHERE id = ?", params)
-    conn.commit()
+    cur.execute(sql, params)
+    if commit:
+        conn.commit()
     return cur.rowcount
 
 
+def update_wrestler_grad_years(conn: sqlite3.Connection, rows: Iterable[Tuple[int, str]],
+                               commit: bool = True) -> None:
+    """Set gradYear for many wrestlers at once. Each row is ``(gradYear, id)``."""
+    conn.executemany(_update_sql("wrestlers", ("gradYear",)), rows)
+    if commit:
+        conn.commit()
+
+
 def update_match(conn: sqlite3.Connection, match_id: str, *, topId: Optional[str] = None,
                  bottomId: Optional[str] = None, winnerId: Optional[str] = None,
                  result: Optional[str] = None, winType: Optional[str] = None,
-                 eventId: Optional[str] = None, weightClass: Optional[str] = None, date: Optional[str] = None) -> int:
+                 eventId: Optional[str] = None, weightClass: Optional[str] = None, date: Optional[str] = None, commit: bool = True) -> int:
     """Update fields on the `matches` table for the given match_id.
 
     Only provided fields are updated. Returns number of rows updated.
@@ -292,11 +689,11 @@ def update_match(conn: sqlite3.Connection, match_id: str, *, topId: Optional[str
     if not fields:
         return 0
 
-    set_clause, params = _build_set_clause(fields)
-    params.append(match_id)
+    sql, params = _build_update("matches", fields, match_id)
     cur = conn.cursor()
-    cur.execute(f"UPDATE matches SET {set_clause} WHERE id = ?", params)
-    conn.commit()
+    cur.execute(sql, params)
+    if commit:
+        conn.commit()
     return cur.rowcount
 
 
@@ -315,12 +712,7 @@ def backfill_match_dates(conn: sqlite3.Connection) -> int:
             WHERE events.id = matches.eventId
         )
         WHERE date IS NULL
-          AND eventId IS NOT NULL
-          AND EXISTS (
-              SELECT 1 FROM events
-              WHERE events.id = matches.eventId
-                AND events.date IS NOT NULL
-          )
+          AND eventId IN (SELECT id FROM events WHERE date IS NOT NULL)
         ;
         """
     )
@@ -330,19 +722,33 @@ def backfill_match_dates(conn: sqlite3.Connection) -> int:
 
 __all__ = [
     "get_connection",
+    "return_connection",
+    "connection",
+    "get_write_connection",
+    "transaction",
+    "submit_write",
+    "run_write",
+    "clear_id_cache",
+    "existing_ids",
     "create_event",
+    "create_events",
     "event_exists",
     "update_event",
     "create_team",
+    "create_teams",
     "team_exists",
     "is_team_crawled",
     "set_team_crawled",
     "update_team",
     "create_wrestler",
+    "upsert_wrestler",
+    "upsert_wrestlers",
     "get_wrestler",
     "wrestler_exists",
     "update_wrestler",
+    "update_wrestler_grad_years",
     "create_match",
+    "create_matches",
     "match_exists",
     "update_match",
     "backfill_match_dates",
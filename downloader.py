@@ -1,5 +1,10 @@
+import queue
+import sqlite3
+import threading
 import requests
-from typing import Literal, Callable, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Iterator, Literal, Callable, Optional, Tuple
 import db
 import api_types
 
@@ -7,39 +12,100 @@ from datetime import datetime
 
 import utils
 
+# (connect, read) timeouts in seconds.
+REQUEST_TIMEOUT = (5, 30)
+
+# Bout win types that never represent a wrestled match.
+_SKIP_WIN_TYPES = frozenset(("BYE", "FOR"))
+
+# Shared keep-alive session so paginated requests reuse the TCP/TLS connection.
+_session = requests.Session()
+_session.mount(
+	"https://",
+	HTTPAdapter(
+		pool_connections=4,
+		pool_maxsize=16,
+		max_retries=Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+	),
+)
+
 event_bout_params = {
 	"include": "event,topWrestler.team,bottomWrestler.team,weightClass,weightClass.division",
 	"fields[event]": "startDateTime,state,name,location,isDual",
 	"fields[bout]": "topWrestlerId,bottomWrestlerId,winnerWrestlerId,result,winType,weightClassId,startDateTime,goDateTime,endDateTime",
-	"fields[wrestler]": "firstName,lastName,state,divisionId,teamId,grade,weightClassId,dateOfBirth,identityPersonId,isWeighInOk",
-	"fields[team]": "name,abbreviation,city,state,identityTeamId",
+	"fields[wrestler]": "firstName,lastName,state,teamId,grade,dateOfBirth,identityPersonId",
+	"fields[team]": "name,state,identityTeamId",
 }
 
 team_bout_paarms = {
 	"include": "event,topWrestler.team,bottomWrestler.team,weightClass,weightClass.division",
 	"fields[event]": "startDateTime,state,name,location,isDual",
 	"fields[bout]": "topWrestlerId,bottomWrestlerId,winnerWrestlerId,result,winType,weightClassId,startDateTime,goDateTime,endDateTime,eventId",
-	"fields[wrestler]": "firstName,lastName,state,divisionId,teamId,grade,weightClassId,dateOfBirth,identityPersonId,isWeighInOk,eventId",
-	"fields[team]": "name,abbreviation,city,state,identityTeamId",
+	"fields[wrestler]": "firstName,lastName,state,teamId,grade,dateOfBirth,identityPersonId,eventId",
+	"fields[team]": "name,state,identityTeamId",
 }
 
-def download_all(url: str, callback=None):
-	req = requests.get(url)
+def _fetch_page(url: str):
+	req = _session.get(url, timeout=REQUEST_TIMEOUT)
 	req.raise_for_status()
-	data = req.json()
-	max = data.get("meta", {}).get("total", 0)
-	downloaded = len(data.get("data", []))
-	if callback:
-		callback(data)
-	while utils.next_link(data, url) :
-		url = utils.next_link(data, url) # type: ignore
-		req = requests.get(url)
-		req.raise_for_status()
-		data = req.json()
-		downloaded += len(data.get("data", []))
+	return utils.json_loads(req.content)
+
+# Pages fetched ahead of the consumer in iter_pages().
+PREFETCH_PAGES = 2
+
+_PAGES_DONE = object()
+
+def iter_pages(url: str) -> Iterator[Tuple[dict, str, float]]:
+	"""Yield ``(data, url, fraction)`` for every page starting at `url`.
+
+	A background thread fetches up to PREFETCH_PAGES pages ahead while the
+	caller handles the current one, so network and database work overlap.
+	Pages are yielded in order; a failed request is re-raised here.
+	"""
+	pages: queue.Queue = queue.Queue(maxsize=PREFETCH_PAGES)
+	stop = threading.Event()
+
+	def _producer() -> None:
+		page_url: Optional[str] = url
+		try:
+			while page_url and not stop.is_set():
+				data = _fetch_page(page_url)
+				pages.put((data, page_url))
+				page_url = utils.next_link(data, page_url)
+		except BaseException as exc:
+			pages.put((exc, None))
+			return
+		pages.put(_PAGES_DONE)
+
+	threading.Thread(target=_producer, name="page-prefetch", daemon=True).start()
+	total: Optional[int] = None
+	downloaded = 0
+	try:
+		while True:
+			item = pages.get()
+			if item is _PAGES_DONE:
+				return
+			data, page_url = item
+			if isinstance(data, BaseException):
+				raise data
+			if total is None:
+				total = data.get("meta", {}).get("total", 0)
+			downloaded += len(data.get("data", []))
+			yield data, page_url, downloaded / total if total > 0 else 0
+	finally:
+		# Unblock the producer if the caller stopped early.
+		stop.set()
+		while not pages.empty():
+			pages.get_nowait()
+
+def download_all(url: str, callback=None):
+	"""Walk every page starting at `url`, passing each one to `callback`."""
+	for index, (data, page_url, fraction) in enumerate(iter_pages(url)):
 		if callback:
-			callback(data, url, downloaded / max if max > 0 else 0)
-			
+			if index == 0:
+				callback(data)
+			else:
+				callback(data, page_url, fraction)
 
 def fetch_events(year: int | None = None, month: int | None = None, event_type: Literal["tournament", "duals", "all"] = "all"):
 	base_url = "https://arena.flowrestling.org/events/past"
@@ -55,10 +121,10 @@ def fetch_events(year: int | None = None, month: int | None = None, event_type:
 	query_string = "&".join(params)
 	full_url = f"{base_url}?{query_string}" if query_string else base_url
 	
-	response = requests.get(full_url)
+	response = _session.get(full_url, timeout=REQUEST_TIMEOUT)
 	response.raise_for_status()
 	
-	return response.json()  # Assuming the response is in JSON format
+	return utils.json_loads(response.content)  # Assuming the response is in JSON format
 
 def get_event_bouts(event_id: str, partial_callback: Callable[[api_types.BoutsResponse, str, float], None] = lambda x, y, z: None):
 	url = f"https://floarena-api.flowrestling.org/bouts/?eventId={event_id}"
@@ -74,138 +140,133 @@ def get_team_bouts(team_id: str, partial_callback: Callable[[api_types.BoutsResp
 	
 	download_all(full_url, callback=partial_callback)
 
+def _person_id(attrs: dict, fallback_id: str) -> str:
+	"""Return identityPersonId, building the ``unknown_`` placeholder only when the key is absent."""
+	if "identityPersonId" in attrs:
+		return attrs["identityPersonId"]
+	return f"unknown_{fallback_id}"
+
 def store_event_bout_data(data: api_types.BoutsResponse, url: str = "", progress: float = 0.0):
-	conn = db.get_connection()
-	
 	lookup = {}
+	team_rows = []
+	wrestler_rows = []
+	match_rows = []
+
+	# Single pass over included: index by id, collect teams, find the
+	# event, and defer wrestlers until every team is in the lookup.
+	event = None
+	wrestlers = []
+	for included in data.get("included", []):
+		lookup[included["id"]] = included
+		item_type = included["type"]
+		if item_type == "team":
+			attrs = included["attributes"]
+			if attrs.get("identityTeamId"):
+				team_rows.append((attrs["identityTeamId"], attrs.get("name"), attrs.get("state"), 0))
+		elif item_type == "wrestler":
+			wrestlers.append(included)
+		elif item_type == "event" and event is None:
+			event = included
 
-	# find type event in included
-	event = next((item for item in data.get("included", []) if item.get("type") == "event"), None)
 	if event is None:
 		return
 
-	for included in data.get("included", []):
-		lookup[included["id"]] = included
-		attrs = included["attributes"]
-		if included["type"] == "team" and attrs.get("identityTeamId"):
-			if not db.team_exists(conn, attrs["identityTeamId"]):
-				db.create_team(
-					conn,
-					team_id=attrs["identityTeamId"],
-					name=attrs.get("name"),
-					state=attrs.get("state"),
-				)
-		if included["type"] == "event" and not db.event_exists(conn, included["id"]):
-			attrs = included["attributes"]
-			db.create_event(
-				conn,
-				event_id=included["id"],
-				name=attrs.get("name"),
-				date=attrs.get("startDateTime"),
-				state=attrs.get("state"),
-				isDual=attrs.get("isDual"),
-				lat=attrs.get("location", {}).get("latitude", None),
-				lon=attrs.get("location", {}).get("longitude", None),
-			)
-	
-	for included in data.get("included", []):
+	event_attrs = event.get("attributes", {})
+	now = datetime.now()
+	lget = lookup.get
+	for included in wrestlers:
 		attrs = included.get("attributes", {})
-		if included["type"] == "wrestler":
-			person_id = attrs.get("identityPersonId", f"unknown_{included['id']}")
-			if not person_id:
-				continue
-			team = lookup.get(attrs.get("teamId"), {}) if attrs.get("teamId") else None
-			team_id = team.get("attributes", {}).get("identityTeamId") if team else None
-			event_attrs = event.get("attributes", {})
-			grade = None
-			if attrs.get("grade"):
-				grade = attrs["grade"].get("attributes", {}).get("numericValue")
-			cur_grade = None
-			if grade is not None and grade >= 8 and event_attrs.get("startDateTime"):
-				cur_grade = utils.calc_cur_grade(
-					past_grade=grade,
-					past_date=event_attrs["startDateTime"],
-					cur_date=datetime.now(),
-				)
-			grad_year = utils.calc_grad_year(grade=cur_grade, as_of=datetime.now()) if cur_grade is not None else None
-			if grad_year is None:
-				grad_year = utils.infer_grad_year_from_post(person_id)
-
-			existing_wrestler = db.get_wrestler(conn, person_id)
-			if existing_wrestler is None:
-				db.create_wrestler(
-					conn,
-					wrestler_id=person_id,
-					name=f"{attrs.get('firstName', '')} {attrs.get('lastName', '')}".strip(),
-					state=attrs.get("state"),
-					gradYear=grad_year,
-					dateOfBirth=attrs.get("dateOfBirth"),
-					teamId=team_id,
-				)
-			else:
-				grad_update = grad_year if (grad_year is not None and existing_wrestler["gradYear"] is None) else None
-				db.update_wrestler(
-					conn,
-					wrestler_id=person_id,
-					gradYear=grad_update,
-					dateOfBirth=attrs.get("dateOfBirth"),
-					teamId=team_id,
-					name=f"{attrs.get('firstName', '')} {attrs.get('lastName', '')}".strip(),
-					state=attrs.get("state"),
-				)
+		aget = attrs.get
+		person_id = _person_id(attrs, included["id"])
+		if not person_id:
+			continue
+		team = lget(aget("teamId"), {}) if aget("teamId") else None
+		team_id = team.get("attributes", {}).get("identityTeamId") if team else None
+		grade = None
+		if aget("grade"):
+			grade = attrs["grade"].get("attributes", {}).get("numericValue")
+		cur_grade = None
+		if grade is not None and grade >= 8 and event_attrs.get("startDateTime"):
+			cur_grade = utils.calc_cur_grade(
+				past_grade=grade,
+				past_date=event_attrs["startDateTime"],
+				cur_date=now,
+			)
+		grad_year = utils.calc_grad_year(grade=cur_grade, as_of=now) if cur_grade is not None else None
+		if grad_year is None:
+			grad_year = utils.infer_grad_year_from_post(person_id)
+
+		wrestler_rows.append((
+			person_id,
+			f"{aget('firstName', '')} {aget('lastName', '')}".strip(),
+			aget("state"),
+			grad_year,
+			aget("dateOfBirth"),
+			team_id,
+		))
 
 	for bout in data["data"]:
 		attrs = bout["attributes"]
+		aget = attrs.get
 
-		if attrs["winType"] in ["BYE", "FOR"]:
+		if attrs["winType"] in _SKIP_WIN_TYPES:
 			continue
-	
-		if attrs.get("winnerWrestlerId") is None:
+
+		winner_id = aget("winnerWrestlerId")
+		if winner_id is None:
 			continue  # skip matches without a winner
 
-		top_wrestler = lookup.get(attrs.get("topWrestlerId")) if attrs.get("topWrestlerId") else None
-		bottom_wrestler = lookup.get(attrs.get("bottomWrestlerId")) if attrs.get("bottomWrestlerId") else None
-		winner_wrestler = lookup.get(attrs.get("winnerWrestlerId")) if attrs.get("winnerWrestlerId") else None
-		weightClass = lookup.get(attrs.get("weightClassId"), {}) if attrs.get("weightClassId") else None
-		division_id = weightClass.get("attributes", {}).get("divisionId") if weightClass else None
-		division = lookup.get(division_id) if division_id else None
-		if not division.get("attributes", {}).get("isVarsity", True) if division else True:
-			continue  # skip non-varsity matches
+		top_id = aget("topWrestlerId")
+		bottom_id = aget("bottomWrestlerId")
+		weight_class_id = aget("weightClassId")
+		weight_class = lget(weight_class_id) if weight_class_id else None
+		wc_attrs = weight_class["attributes"] if weight_class else None
+		division_id = wc_attrs.get("divisionId") if wc_attrs else None
+		division = lget(division_id) if division_id else None
+		if division is None or not division["attributes"].get("isVarsity", True):
+			continue  # skip non-varsity matches (and bouts without a division)
+		top_wrestler = lget(top_id) if top_id else None
+		bottom_wrestler = lget(bottom_id) if bottom_id else None
+		winner_wrestler = lget(winner_id) if winner_id else None
 		if top_wrestler is None:
 			continue  # skip invalid wrestlers
 		if bottom_wrestler is None:
 			continue  # skip invalid wrestlers
 
-		date = attrs.get("startDateTime") or attrs.get("goDateTime") or attrs.get("endDateTime")
+		date = aget("startDateTime") or aget("goDateTime") or aget("endDateTime")
 		if date is None:
-			date = event.get("attributes", {}).get("startDateTime")
-
-		if not db.match_exists(conn, bout["id"]):
-			db.create_match(
-				conn,
-				match_id=bout["id"],
-				topId=top_wrestler["attributes"].get("identityPersonId", f"unknown_{attrs.get('topWrestlerId')}") if top_wrestler else None,
-				bottomId=bottom_wrestler["attributes"].get("identityPersonId", f"unknown_{attrs.get('bottomWrestlerId')}") if bottom_wrestler else None,
-				winnerId=winner_wrestler["attributes"].get("identityPersonId", f"unknown_{attrs.get('winnerWrestlerId')}") if winner_wrestler else None,
-				result=attrs.get("result"),
-				winType=attrs.get("winType"),
-				eventId=event["id"],
-				weightClass=lookup.get(attrs.get("weightClassId"), {}).get("attributes", {}).get("name"),
-				date=date,
-			)
-	
-	if not utils.next_link(data, url) and not db.event_exists(conn, event["id"]):
-		attrs = event["attributes"]
+			date = event_attrs.get("startDateTime")
+
+		match_rows.append((
+			bout["id"],
+			_person_id(top_wrestler["attributes"], top_id),
+			_person_id(bottom_wrestler["attributes"], bottom_id),
+			_person_id(winner_wrestler["attributes"], winner_id) if winner_wrestler else None,
+			aget("result"),
+			aget("winType"),
+			event["id"],
+			wc_attrs.get("name"),
+			date,
+		))
+
+	# Hand the whole page to the writer thread as one transaction.
+	def _write_page(writer: sqlite3.Connection) -> None:
 		db.create_event(
-			conn,
+			writer,
 			event_id=event["id"],
-			name=attrs.get("name"),
-			date=attrs.get("startDateTime"),
-			state=attrs.get("state"),
-			isDual=attrs.get("isDual"),
-			lat=attrs.get("location", {}).get("latitude", None),
-			lon=attrs.get("location", {}).get("longitude", None),
+			name=event_attrs.get("name"),
+			date=event_attrs.get("startDateTime"),
+			state=event_attrs.get("state"),
+			isDual=event_attrs.get("isDual"),
+			lat=event_attrs.get("location", {}).get("latitude", None),
+			lon=event_attrs.get("location", {}).get("longitude", None),
+			commit=False,
 		)
+		db.create_teams(writer, team_rows, commit=False)
+		db.upsert_wrestlers(writer, wrestler_rows, commit=False)
+		db.create_matches(writer, match_rows, commit=False)
+
+	db.run_write(_write_page)
 
 def store_event(event_id: str, progress_callback: Optional[Callable[[float], None]] = None):
 	"""Fetch and persist a single event, informing caller about download progress."""
@@ -221,112 +282,118 @@ def store_event(event_id: str, progress_callback: Optional[Callable[[float], Non
 		progress_callback(1.0)
 
 def store_team_bout_data(data: api_types.BoutsResponse, url: str = "", progress: float = 0.0):
-	conn = db.get_connection()
-	
 	lookup = {}
-
-
+	team_rows = []
+	event_rows = []
+	wrestler_rows = []
+	match_rows = []
+
+	# Single pass over included; wrestlers are handled once every team
+	# and event is in the lookup.
+	wrestlers = []
 	for included in data.get("included", []):
 		lookup[included["id"]] = included
+		item_type = included["type"]
 		attrs = included["attributes"]
-		if included["type"] == "team" and attrs.get("identityTeamId"):
-			if not db.team_exists(conn, attrs["identityTeamId"]):
-				db.create_team(
-					conn,
-					team_id=attrs["identityTeamId"],
-					name=attrs.get("name"),
-					state=attrs.get("state"),
-				)
-		if included["type"] == "event":
-			if not db.event_exists(conn, included["id"]):
-				attrs = included["attributes"]
-				db.create_event(
-					conn,
-					event_id=included["id"],
-					name=attrs.get("name"),
-					date=attrs.get("startDateTime"),
-					state=attrs.get("state"),
-					isDual=attrs.get("isDual"),
-					lat=attrs.get("location", {}).get("latitude", None),
-					lon=attrs.get("location", {}).get("longitude", None),
-				)
-	
-	for included in data.get("included", []):
+		if item_type == "team":
+			if attrs.get("identityTeamId"):
+				team_rows.append((attrs["identityTeamId"], attrs.get("name"), attrs.get("state"), 0))
+		elif item_type == "wrestler":
+			wrestlers.append(included)
+		elif item_type == "event":
+			event_rows.append((
+				included["id"],
+				attrs.get("startDateTime"),
+				attrs.get("state"),
+				attrs.get("name"),
+				db._bool_to_int(attrs.get("isDual")),
+				attrs.get("location", {}).get("latitude", None),
+				attrs.get("location", {}).get("longitude", None),
+			))
+
+	now = datetime.now()
+	lget = lookup.get
+	for included in wrestlers:
 		attrs = included["attributes"]
-		if included["type"] == "wrestler":
-			team = lookup.get(attrs["teamId"], {})
-			event = lookup.get(attrs["eventId"], {})
-			team_id = team["attributes"]["identityTeamId"] if team else None
-			grade = attrs.get("grade").get("attributes", {}).get("numericValue") if attrs.get("grade") else None
-			cur_grade = utils.calc_cur_grade(past_grade=grade, past_date=event["attributes"]["startDateTime"], cur_date=datetime.now()) if grade is not None and grade >= 8 else None
-			grad_year = utils.calc_grad_year(grade=cur_grade, as_of=datetime.now()) if cur_grade is not None else None
-			if grad_year is None:
-				grad_year = utils.infer_grad_year_from_post(attrs.get("identityPersonId"))
-
-			if not db.wrestler_exists(conn, attrs["identityPersonId"]) and attrs.get("identityPersonId"):
-				db.create_wrestler(
-					conn,
-					wrestler_id=attrs.get("identityPersonId"),
-					name=f"{attrs.get('firstName', '')} {attrs.get('lastName', '')}".strip(),
-					state=attrs.get("state"),
-					gradYear=grad_year,
-					dateOfBirth=attrs.get("dateOfBirth"),
-					teamId=team_id,
-				)
-			else:
-				db.update_wrestler(
-					conn,
-					wrestler_id=attrs["identityPersonId"],
-					gradYear=grad_year,
-					dateOfBirth=attrs.get("dateOfBirth"),
-					teamId=team_id,
-					name=f"{attrs.get('firstName', '')} {attrs.get('lastName', '')}".strip(),
-					state=attrs.get("state"),
-				)
+		aget = attrs.get
+		team = lget(attrs["teamId"], {})
+		event = lget(attrs["eventId"], {})
+		team_id = team["attributes"]["identityTeamId"] if team else None
+		grade = aget("grade").get("attributes", {}).get("numericValue") if aget("grade") else None
+		cur_grade = utils.calc_cur_grade(past_grade=grade, past_date=event["attributes"]["startDateTime"], cur_date=now) if grade is not None and grade >= 8 else None
+		grad_year = utils.calc_grad_year(grade=cur_grade, as_of=now) if cur_grade is not None else None
+		if grad_year is None:
+			grad_year = utils.infer_grad_year_from_post(aget("identityPersonId"))
+
+		if aget("identityPersonId"):
+			wrestler_rows.append((
+				attrs["identityPersonId"],
+				f"{aget('firstName', '')} {aget('lastName', '')}".strip(),
+				aget("state"),
+				grad_year,
+				aget("dateOfBirth"),
+				team_id,
+			))
 
 	for bout in data["data"]:
 		attrs = bout["attributes"]
+		aget = attrs.get
 
-		if attrs["winType"] in ["BYE", "FOR"]:
+		if attrs["winType"] in _SKIP_WIN_TYPES:
 			continue
-	
-		if attrs.get("winnerWrestlerId") is None:
-			continue  # skip matches without a winner
 
-		event = lookup.get(attrs["eventId"], {})
+		winner_id = aget("winnerWrestlerId")
+		if winner_id is None:
+			continue  # skip matches without a winner
 
-		top_wrestler = lookup.get(attrs["topWrestlerId"]) if attrs["topWrestlerId"] else None
-		bottom_wrestler = lookup.get(attrs["bottomWrestlerId"]) if attrs["bottomWrestlerId"] else None
-		winner_wrestler = lookup.get(attrs.get("winnerWrestlerId")) if attrs.get("winnerWrestlerId") else None
-		weightClass = lookup.get(attrs["weightClassId"], {}) if attrs["weightClassId"] else None
-		division = lookup.get(lookup.get(attrs["weightClassId"], {}).get("attributes", {}).get("divisionId", None), {}) if weightClass else None
-		if not division.get("attributes", {}).get("isVarsity", True) if division else True:
-			continue  # skip non-varsity matches
-		if top_wrestler is None or top_wrestler.get("attributes", {}).get("identityPersonId") is None:
+		top_id = aget("topWrestlerId")
+		bottom_id = aget("bottomWrestlerId")
+		weight_class_id = aget("weightClassId")
+		weight_class = lget(weight_class_id) if weight_class_id else None
+		wc_attrs = weight_class["attributes"] if weight_class else None
+		division_id = wc_attrs.get("divisionId") if wc_attrs else None
+		division = lget(division_id) if division_id else None
+		if not division or not division["attributes"].get("isVarsity", True):
+			continue  # skip non-varsity matches (and bouts without a division)
+		top_wrestler = lget(top_id) if top_id else None
+		bottom_wrestler = lget(bottom_id) if bottom_id else None
+		winner_wrestler = lget(winner_id) if winner_id else None
+		top_person_id = top_wrestler["attributes"].get("identityPersonId") if top_wrestler else None
+		if top_person_id is None:
 			continue  # skip invalid wrestlers
-		if bottom_wrestler is None or bottom_wrestler.get("attributes", {}).get("identityPersonId") is None:
+		bottom_person_id = bottom_wrestler["attributes"].get("identityPersonId") if bottom_wrestler else None
+		if bottom_person_id is None:
 			continue  # skip invalid wrestlers
 
-		date = attrs.get("startDateTime")
+		event = lget(attrs["eventId"], {})
+		date = aget("startDateTime")
 		if date is None:
-			date = attrs.get("goDateTime")
+			date = aget("goDateTime")
 		if date is None:
-			date = attrs.get("endDateTime")
+			date = aget("endDateTime")
 		if date is None:
 			date = event.get("attributes", {}).get("startDateTime")
-		if not db.match_exists(conn, bout["id"]):
-			db.create_match(
-				conn,
-				match_id=bout["id"],
-				topId=top_wrestler["attributes"]["identityPersonId"] if top_wrestler else None,
-				bottomId=bottom_wrestler["attributes"]["identityPersonId"] if bottom_wrestler else None,
-				winnerId=winner_wrestler["attributes"]["identityPersonId"] if winner_wrestler else None,
-				result=attrs.get("result"),
-				winType=attrs.get("winType"),
-				eventId=event["id"],
-				weightClass=lookup.get(attrs["weightClassId"], {}).get("attributes", {}).get("name", None),
-				date=date
-			)
+		match_rows.append((
+			bout["id"],
+			top_person_id,
+			bottom_person_id,
+			winner_wrestler["attributes"]["identityPersonId"] if winner_wrestler else None,
+			aget("result"),
+			aget("winType"),
+			event["id"],
+			wc_attrs.get("name"),
+			date,
+		))
+
+	# Rows are built without holding the write lock; hand the whole page to
+	# the writer thread as one transaction.
+	def _write_page(writer: sqlite3.Connection) -> None:
+		db.create_teams(writer, team_rows, commit=False)
+		db.create_events(writer, event_rows, commit=False)
+		db.upsert_wrestlers(writer, wrestler_rows, overwrite_grad_year=True, commit=False)
+		db.create_matches(writer, match_rows, commit=False)
+
+	db.run_write(_write_page)
 
 
 def store_team(
@@ -362,9 +429,12 @@ def store_team(
 			progress_callback(max(0.0, min(1.0, fraction)))
 
 	get_team_bouts(team_id, partial_callback=_partial_callback)
-	conn = db.get_connection()
-	if not db.team_exists(conn, team_id):
-		db.create_team(conn, team_id=team_id)
-	db.set_team_crawled(conn, team_id, True)
+
+	def _mark_crawled(writer: sqlite3.Connection) -> None:
+		# create_team leaves an existing row alone, so no existence probe is needed.
+		db.create_team(writer, team_id=team_id, commit=False)
+		db.update_team(writer, team_id, crawled=True, commit=False)
+
+	db.run_write(_mark_crawled)
 	if progress_callback is not None:
 		progress_callback(1.0)
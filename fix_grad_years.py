@@ -19,9 +19,7 @@ def load_top_leaderboard_ids(path: Path, top_n: int) -> set[str]:
 		console.print(f"[red]Leaderboard file not found: {path}")
 		return set()
 	try:
-		import json
-		with path.open("r", encoding="utf-8") as fh:
-			data = json.load(fh)
+		data = utils.json_loads(path.read_bytes())
 	except Exception as exc:  # noqa: BLE001
 		console.print(f"[red]Failed to read leaderboard: {exc}")
 		return set()
@@ -49,7 +47,7 @@ def fix_grad_years(dry_run: bool = False, only_ids: set[str] | None = None) -> i
 		console.print("[green]No wrestlers with missing gradYear.")
 		return 0
 
-	updated = 0
+	updates: list[tuple[int, str]] = []
 	with Progress(
 		SpinnerColumn(),
 		TextColumn("{task.description}"),
@@ -63,12 +61,15 @@ def fix_grad_years(dry_run: bool = False, only_ids: set[str] | None = None) -> i
 		for wrestler_id in wrestlers:
 			grad_year = utils.infer_grad_year_from_post(wrestler_id)
 			if grad_year is not None:
-				updated += 1
-				if not dry_run:
-					db.update_wrestler(conn, wrestler_id=wrestler_id, gradYear=grad_year)
+				updates.append((grad_year, wrestler_id))
 			progress.advance(task)
 
-	return updated
+	# Write every inferred year in one statement and one commit.
+	if updates and not dry_run:
+		db.update_wrestler_grad_years(conn, updates)
+		utils.invalidate_caches()
+
+	return len(updates)
 
 
 def main() -> None:
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import argparse
-import json
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Mapping, Sequence
 
@@ -20,9 +20,13 @@ from rich.progress import (
 )
 
 import downloader
+import utils
 
 console = Console()
 
+# Events or teams downloaded at once; the db writer thread serializes the page writes.
+DEFAULT_WORKERS = 8
+
 
 def parse_args() -> argparse.Namespace:
 	parser = argparse.ArgumentParser(description="Download and store wrestling events")
@@ -45,25 +49,29 @@ def parse_args() -> argparse.Namespace:
 		default=Path("alignments/miaa.json"),
 		help="Path to the JSON file containing team alignment metadata.",
 	)
+	parser.add_argument(
+		"--workers",
+		type=int,
+		default=DEFAULT_WORKERS,
+		help="Number of events or teams to download concurrently.",
+	)
 	return parser.parse_args()
 
 
 def load_events(path: Path) -> Sequence[Mapping]:
 	if not path.exists():
 		raise FileNotFoundError(f"Events file not found: {path}")
-	with path.open("r", encoding="utf-8") as fh:
-		data = json.load(fh)
-		if isinstance(data, list):
-			return list(reversed(data))
-			
-		return list(reversed(data.get("data", [])))  # type: ignore[call-arg]
+	data = utils.json_loads(path.read_bytes())
+	events = data if isinstance(data, list) else data.get("data", [])
+	# Reverse in place rather than copying the (possibly large) list.
+	events.reverse()
+	return events
 
 
 def load_team_ids(path: Path) -> Sequence[str]:
 	if not path.exists():
 		raise FileNotFoundError(f"Teams file not found: {path}")
-	with path.open("r", encoding="utf-8") as fh:
-		data = json.load(fh)
+	data = utils.json_loads(path.read_bytes())
 
 	teams: list[str] = []
 	seen: set[str] = set()
@@ -81,12 +89,31 @@ def load_team_ids(path: Path) -> Sequence[str]:
 	return teams
 
 
-def process_events(events: Sequence[Mapping]) -> None:
+def process_events(events: Sequence[Mapping], workers: int = DEFAULT_WORKERS) -> None:
 	if not events:
 		console.print("[yellow]No events to process.")
 		return
 
-	conn = db.get_connection()
+	# Drop events that will be skipped before sizing the progress bars, then
+	# probe the database for the rest in one query.
+	candidates: dict[str, str] = {}
+	for event in events:
+		event_id = event.get("guid")
+		if not event_id:
+			console.print("[red]Skipping event without ID")
+			continue
+		if not event.get("hasBrackets", False):
+			continue
+		event_name = (
+			event.get("name")
+			or event.get("attributes", {}).get("name")
+			or "Unnamed Event"
+		)
+		candidates.setdefault(str(event_id), event_name)
+
+	with db.connection() as conn:
+		stored = db.existing_ids(conn, "events", candidates)
+	pending = [(event_id, name) for event_id, name in candidates.items() if event_id not in stored]
 
 	with Progress(
 		SpinnerColumn(),
@@ -96,44 +123,14 @@ def process_events(events: Sequence[Mapping]) -> None:
 		TimeElapsedColumn(),
 		TimeRemainingColumn(),
 		console=console,
-	) as progress:
-		download_task = progress.add_task("Downloading events", total=len(events))
-		store_task = progress.add_task("Storing events", total=len(events))
-		event_progress_task = progress.add_task("Event progress", total=100, visible=False)
-
-		for event in events:
-			event_id = event.get("guid")
-			if not event_id:
-				progress.console.print("[red]Skipping event without ID")
-				progress.advance(download_task)
-				progress.advance(store_task)
-				continue
-			
-			event_name = (
-				event.get("name")
-				or event.get("attributes", {}).get("name")
-				or "Unnamed Event"
-			)
-			if not event.get("hasBrackets", False):
-				#progress.console.print(f"[yellow]Skipping event {event_name} without brackets")
-				progress.advance(download_task)
-				progress.advance(store_task)
-				continue
-
-			if db.event_exists(db.get_connection(), event_id):
-				#progress.console.print(f"[blue]Event {event_name} already exists in the database, skipping.")
-				progress.advance(download_task)
-				progress.advance(store_task)
-				continue
+	) as progress, ThreadPoolExecutor(max_workers=workers) as executor:
+		download_task = progress.add_task("Downloading events", total=len(pending))
+		store_task = progress.add_task("Storing events", total=len(pending))
 
-			progress.update(download_task, description=f"Downloading {event_name}")
-			progress.update(
-				event_progress_task,
-				description=f"{event_name} pages",
-				completed=0,
-				total=100,
-				visible=True,
-			)
+		def _store(event_id: str, event_name: str) -> None:
+			# Workers only download and build rows; page writes are funneled
+			# through the db writer thread.
+			event_progress_task = progress.add_task(f"{event_name} pages", total=100)
 
 			def _update_event_progress(fraction: float) -> None:
 				progress.update(
@@ -142,26 +139,37 @@ def process_events(events: Sequence[Mapping]) -> None:
 				)
 
 			try:
-				downloader.store_event(str(event_id), progress_callback=_update_event_progress)
+				downloader.store_event(event_id, progress_callback=_update_event_progress)
 			finally:
-				progress.update(event_progress_task, completed=100, visible=False)
-
-			progress.advance(download_task)
+				progress.remove_task(event_progress_task)
+
+		futures = {
+			executor.submit(_store, event_id, event_name): event_name
+			for event_id, event_name in pending
+		}
+		try:
+			for future in as_completed(futures):
+				event_name = futures[future]
+				future.result()
+				progress.advance(download_task)
 
-			progress.update(store_task, description=f"Stored {event_name}")
-			progress.advance(store_task)
+				progress.update(store_task, description=f"Stored {event_name}")
+				progress.advance(store_task)
+		except BaseException:
+			# Drop queued events so a failure or Ctrl-C stops the crawl now
+			# instead of after every remaining download.
+			executor.shutdown(wait=False, cancel_futures=True)
+			raise
 
 	console.print("[green]Finished downloading and storing all events!", highlight=False)
 
 
-def process_teams(team_ids: Sequence[str]) -> None:
+def process_teams(team_ids: Sequence[str], workers: int = DEFAULT_WORKERS) -> None:
 	if not team_ids:
 		console.print("[yellow]No teams to process.")
 		return
 
-	conn = db.get_connection()
-
-	with Progress(
+	with db.connection() as conn, Progress(
 		SpinnerColumn(),
 		TextColumn("{task.description}"),
 		BarColumn(bar_width=None),
@@ -169,34 +177,17 @@ def process_teams(team_ids: Sequence[str]) -> None:
 		TimeElapsedColumn(),
 		TimeRemainingColumn(),
 		console=console,
-	) as progress:
+	) as progress, ThreadPoolExecutor(max_workers=workers) as executor:
 		download_task = progress.add_task("Downloading teams", total=len(team_ids))
 		store_task = progress.add_task("Storing teams", total=len(team_ids))
-		team_progress_task = progress.add_task("Team progress", total=100, visible=False)
 
-		for team_id in team_ids:
+		def _store(team_id: str) -> str:
 			team_label = team_id
-			if db.is_team_crawled(conn, team_id):
-				progress.console.print(
-					f"[blue]Team {team_label} already crawled, skipping."
-				)
-				progress.advance(download_task)
-				progress.advance(store_task)
-				continue
-
-			progress.update(download_task, description=f"Downloading team {team_label}")
-			progress.update(
-				team_progress_task,
-				description=f"{team_label} pages",
-				completed=0,
-				total=100,
-				visible=True,
-			)
+			team_progress_task = progress.add_task(f"{team_label} pages", total=100)
 
 			def _update_label(new_label: str) -> None:
 				nonlocal team_label
 				team_label = new_label or team_label
-				progress.update(download_task, description=f"Downloading team {team_label}")
 				progress.update(team_progress_task, description=f"{team_label} pages")
 
 			def _update_team_progress(fraction: float) -> None:
@@ -212,12 +203,33 @@ def process_teams(team_ids: Sequence[str]) -> None:
 					name_callback=_update_label,
 				)
 			finally:
-				progress.update(team_progress_task, completed=100, visible=False)
+				progress.remove_task(team_progress_task)
+			return team_label
+
+		futures: list[Future] = []
+		try:
+			for team_id in team_ids:
+				if db.is_team_crawled(conn, team_id):
+					progress.console.print(
+						f"[blue]Team {team_id} already crawled, skipping."
+					)
+					progress.advance(download_task)
+					progress.advance(store_task)
+					continue
 
-			progress.advance(download_task)
+				futures.append(executor.submit(_store, team_id))
 
-			progress.update(store_task, description=f"Stored team {team_label}")
-			progress.advance(store_task)
+			for future in as_completed(futures):
+				team_label = future.result()
+				progress.advance(download_task)
+
+				progress.update(store_task, description=f"Stored team {team_label}")
+				progress.advance(store_task)
+		except BaseException:
+			# Drop queued teams so a failure or Ctrl-C stops the crawl now
+			# instead of after every remaining download.
+			executor.shutdown(wait=False, cancel_futures=True)
+			raise
 
 	console.print("[green]Finished downloading and storing all teams!", highlight=False)
 
@@ -226,9 +238,9 @@ def main() -> None:
 	args = parse_args()
 	try:
 		if args.mode == "events":
-			process_events(load_events(args.events_file))
+			process_events(load_events(args.events_file), workers=args.workers)
 		else:
-			process_teams(load_team_ids(args.teams_file))
+			process_teams(load_team_ids(args.teams_file), workers=args.workers)
 	except FileNotFoundError as exc:
 		console.print(f"[red]{exc}")
 		return
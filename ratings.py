@@ -5,17 +5,24 @@ from __future__ import annotations
 import argparse
 import json
 import math
-from collections import Counter, defaultdict
-from dataclasses import dataclass
+import os
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from functools import cmp_to_key
+from functools import cmp_to_key, partial
 from pathlib import Path
 from typing import Any, Iterable, Mapping, Sequence
 
+import numpy as np
+
 import utils
 
 
 SCALE = 173.7178
+# Precomputed factors so the hot paths multiply instead of divide.
+_INV_SCALE = 1.0 / SCALE
+_G_FACTOR = 3.0 / (math.pi * math.pi)
 DEFAULT_RATING = 1500.0
 DEFAULT_RD = 350.0
 DEFAULT_SIGMA = 0.06
@@ -51,14 +58,14 @@ DEFAULT_OTHER_WEIGHT = 0.65
 DEFAULT_TAU_CANDIDATES = [0.1, 0.2, 0.3, 0.4, 0.5, 0.7]
 
 
-@dataclass
+@dataclass(slots=True)
 class RatingPeriod:
 	start: datetime
 	end: datetime
 	season: str
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchResult:
 	id: str
 	date: datetime
@@ -69,22 +76,47 @@ class MatchResult:
 	weight_class: str | None
 
 
-@dataclass
+@dataclass(slots=True)
 class Glicko2State:
 	rating: float = DEFAULT_RATING
 	rd: float = DEFAULT_RD
 	sigma: float = DEFAULT_SIGMA
 
 
-@dataclass
+@dataclass(slots=True)
 class RatingRunResult:
 	ratings: dict[str, Glicko2State]
 	head_to_head: dict[tuple[str, str], int]
 	weight_counts: dict[str, Counter[str]]
-	predictions: list[tuple[float, float]]
+	# One row per rated match: the top wrestler's expected score, then the actual score.
+	predictions: np.ndarray
+	primary_weights: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class PeriodArrays:
+	"""One period's informative matches as row-index and result arrays."""
+
+	top: np.ndarray
+	bottom: np.ndarray
+	score: np.ndarray
+	weight: np.ndarray
+	n_known: int
+	n_players: int
+
+
+def _win_weight(win_type: str | None, win_type_weights: Mapping[str, float]) -> float:
+	key = (win_type or "").upper()
+	return win_type_weights.get(key, DEFAULT_OTHER_WEIGHT)
 
 
 class Glicko2:
+	"""Glicko-2 engine keeping player state in parallel NumPy arrays.
+
+	Wrestler ids are mapped to row indices by ``index``; ``rating``, ``rd`` and
+	``sigma`` hold the state for each row so a whole period updates at once.
+	"""
+
 	def __init__(
 		self,
 		tau: float,
@@ -100,42 +132,70 @@ class Glicko2:
 		self.max_rd = max_rd
 		self.season_rd_floor = season_rd_floor
 		self.weight_history_limit = max(1, weight_history_limit)
-		self.states: dict[str, Glicko2State] = {}
-		self.weight_history: defaultdict[str, list[str]] = defaultdict(list)
-
-	def ensure_player(self, wrestler_id: str) -> None:
-		if wrestler_id not in self.states:
-			self.states[wrestler_id] = Glicko2State()
+		self.index: dict[str, int] = {}
+		self.ids: list[str] = []
+		self.rating = np.empty(0)
+		self.rd = np.empty(0)
+		self.sigma = np.empty(0)
+		self.weight_history: defaultdict[str, deque[str]] = defaultdict(
+			lambda: deque(maxlen=self.weight_history_limit)
+		)
+		self.primary_weight: dict[str, str] = {}
+
+	def ensure_player(self, wrestler_id: str) -> int:
+		"""Register a wrestler if needed and return their row index."""
+		idx = self.index.get(wrestler_id)
+		if idx is None:
+			idx = len(self.ids)
+			self.index[wrestler_id] = idx
+			self.ids.append(wrestler_id)
+		return idx
+
+	def _sync_arrays(self) -> None:
+		"""Give newly registered players default rows in the state arrays."""
+		missing = len(self.ids) - len(self.rating)
+		if missing > 0:
+			self.rating = np.concatenate((self.rating, np.full(missing, DEFAULT_RATING)))
+			self.rd = np.concatenate((self.rd, np.full(missing, DEFAULT_RD)))
+			self.sigma = np.concatenate((self.sigma, np.full(missing, DEFAULT_SIGMA)))
+
+	@property
+	def states(self) -> dict[str, Glicko2State]:
+		"""Current state of every player, built fresh on each access."""
+		self._sync_arrays()
+		return {
+			wrestler_id: Glicko2State(rating=rating, rd=rd, sigma=sigma)
+			for wrestler_id, rating, rd, sigma in zip(self.ids, self.rating.tolist(), self.rd.tolist(), self.sigma.tolist())
+		}
 
 	def _g(self, phi: float) -> float:
-		return 1 / math.sqrt(1 + 3 * (phi ** 2) / (math.pi ** 2))
+		return 1.0 / math.sqrt(1.0 + _G_FACTOR * phi * phi)
 
 	def _expected(self, mu: float, mu_j: float, phi_j: float) -> float:
 		return 1 / (1 + math.exp(-self._g(phi_j) * (mu - mu_j)))
 
 	def win_probability(self, player: Glicko2State, opponent: Glicko2State) -> float:
-		mu = (player.rating - DEFAULT_RATING) / SCALE
-		mu_j = (opponent.rating - DEFAULT_RATING) / SCALE
-		phi_j = opponent.rd / SCALE
+		mu = (player.rating - DEFAULT_RATING) * _INV_SCALE
+		mu_j = (opponent.rating - DEFAULT_RATING) * _INV_SCALE
+		phi_j = opponent.rd * _INV_SCALE
 		return self._expected(mu, mu_j, phi_j)
 
 	def _win_weight(self, win_type: str | None) -> float:
-		key = (win_type or "").upper()
-		return self.win_type_weights.get(key, DEFAULT_OTHER_WEIGHT)
+		return _win_weight(win_type, self.win_type_weights)
 
 	def inflate_for_gap(self, months: float) -> None:
 		if months <= 0:
 			return
-		for state in self.states.values():
-			phi = state.rd / SCALE
-			phi = math.sqrt(phi * phi + months * state.sigma * state.sigma)
-			state.rd = min(self.max_rd, max(self.min_rd, phi * SCALE))
+		self._sync_arrays()
+		phi = self.rd * _INV_SCALE
+		phi = np.sqrt(phi * phi + months * self.sigma * self.sigma)
+		self.rd = np.clip(phi * SCALE, self.min_rd, self.max_rd)
 
 	def reset_rd_for_season(self) -> None:
 		"""Increase RD to ensure more volatility heading into a new season."""
+		self._sync_arrays()
 		floor = max(self.min_rd, min(self.max_rd, self.season_rd_floor))
-		for state in self.states.values():
-			state.rd = min(self.max_rd, max(state.rd, floor))
+		self.rd = np.minimum(self.max_rd, np.maximum(self.rd, floor))
 
 	def _record_weight_class(
 		self,
@@ -146,133 +206,155 @@ class Glicko2:
 		if not weight_class:
 			return
 		history = self.weight_history[wrestler_id]
+		# A full deque drops its oldest class on append; remember it first.
+		evicted = history[0] if len(history) == history.maxlen else None
 		history.append(weight_class)
-		weight_counts[wrestler_id][weight_class] += 1
-		if len(history) > self.weight_history_limit:
-			removed = history.pop(0)
-			weight_counts[wrestler_id][removed] -= 1
-			if weight_counts[wrestler_id][removed] <= 0:
-				del weight_counts[wrestler_id][removed]
-
-	def _update_player(
-		self,
-		player: Glicko2State,
-		results: Sequence[tuple[Glicko2State, float, float]],
-	) -> Glicko2State:
-		mu = (player.rating - DEFAULT_RATING) / SCALE
-		phi = player.rd / SCALE
-		phi_star = math.sqrt(phi * phi + player.sigma * player.sigma)
-
-		if not results:
-			return Glicko2State(
-				rating=player.rating,
-				rd=min(self.max_rd, max(self.min_rd, phi_star * SCALE)),
-				sigma=player.sigma,
-			)
-
-		v_inv = 0.0
-		delta_sum = 0.0
-
-		for opponent, score, weight in results:
-			mu_j = (opponent.rating - DEFAULT_RATING) / SCALE
-			phi_j = opponent.rd / SCALE
-			g_phi = self._g(phi_j)
-			E = self._expected(mu, mu_j, phi_j)
-			v_inv += weight * (g_phi ** 2) * E * (1 - E)
-			delta_sum += weight * g_phi * (score - E)
-
-		if v_inv == 0:
-			return Glicko2State(
-				rating=player.rating,
-				rd=min(self.max_rd, max(self.min_rd, phi_star * SCALE)),
-				sigma=player.sigma,
-			)
-
-		v = 1.0 / v_inv
-		delta = v * delta_sum
-
-		a = math.log(player.sigma ** 2)
-
-		def f(x: float) -> float:
-			exp_x = math.exp(x)
-			num = exp_x * (delta ** 2 - phi_star ** 2 - v - exp_x)
-			denom = 2 * (phi_star ** 2 + v + exp_x) ** 2
-			return (num / denom) - ((x - a) / (self.tau ** 2))
-
-		A = a
-		if delta ** 2 > phi_star ** 2 + v:
-			B = math.log(delta ** 2 - phi_star ** 2 - v)
-		else:
-			k = 1
-			while f(a - k * self.tau) < 0:
-				k += 1
-			B = a - k * self.tau
-
-		fA = f(A)
-		fB = f(B)
-
-		while abs(B - A) > 1e-6:
-			C = A + (A - B) * fA / (fB - fA)
-			fC = f(C)
-			if fC * fB < 0:
-				A = B
-				fA = fB
-			else:
-				fA = fA / 2
-			B = C
-			fB = fC
-
-		sigma_prime = math.exp(A / 2)
-		phi_prime = 1 / math.sqrt(1 / (phi_star ** 2 + sigma_prime ** 2) + 1 / v)
-		mu_prime = mu + (phi_prime ** 2) * delta_sum
-
-		return Glicko2State(
-			rating=DEFAULT_RATING + mu_prime * SCALE,
-			rd=min(self.max_rd, max(self.min_rd, phi_prime * SCALE)),
-			sigma=sigma_prime,
-		)
-
-	def process_period(
+		counts = weight_counts[wrestler_id]
+		counts[weight_class] += 1
+		# Keep primary_weight equal to counts.most_common(1): the highest
+		# count, with ties going to the class counted first.
+		primary = self.primary_weight.get(wrestler_id)
+		if primary is None:
+			self.primary_weight[wrestler_id] = weight_class
+		elif primary != weight_class:
+			count, primary_count = counts[weight_class], counts[primary]
+			if count > primary_count or (
+				count == primary_count and next(k for k in counts if k in (weight_class, primary)) == weight_class
+			):
+				self.primary_weight[wrestler_id] = weight_class
+		if evicted is not None:
+			counts[evicted] -= 1
+			if counts[evicted] <= 0:
+				del counts[evicted]
+			if evicted == self.primary_weight[wrestler_id]:
+				[(self.primary_weight[wrestler_id], _)] = counts.most_common(1)
+
+	def _new_sigmas(self, sigma: np.ndarray, phi_star: np.ndarray, v: np.ndarray, delta: np.ndarray) -> np.ndarray:
+		"""Solve for the updated volatilities with a batched Illinois algorithm.
+
+		Every player runs the same iteration as the scalar algorithm; players
+		drop out of the working set once their bracket is within 1e-6.
+		"""
+		a = np.log(sigma ** 2)
+		delta_sq = delta ** 2
+		phi_star_sq = phi_star ** 2
+		tau_sq = self.tau ** 2
+
+		def f(x: np.ndarray, rows: np.ndarray) -> np.ndarray:
+			exp_x = np.exp(x)
+			num = exp_x * (delta_sq[rows] - phi_star_sq[rows] - v[rows] - exp_x)
+			denom = 2 * (phi_star_sq[rows] + v[rows] + exp_x) ** 2
+			return (num / denom) - ((x - a[rows]) / tau_sq)
+
+		everyone = np.arange(len(a))
+		A = a.copy()
+		B = np.empty_like(a)
+		wide = delta_sq > phi_star_sq + v
+		B[wide] = np.log(delta_sq[wide] - phi_star_sq[wide] - v[wide])
+
+		# Step the lower bracket down by tau until f changes sign.
+		narrow = np.flatnonzero(~wide)
+		k = np.ones(len(narrow))
+		pending = np.arange(len(narrow))
+		while len(pending):
+			rows = narrow[pending]
+			pending = pending[f(a[rows] - k[pending] * self.tau, rows) < 0]
+			k[pending] += 1
+		B[narrow] = a[narrow] - k * self.tau
+
+		fA = f(A, everyone)
+		fB = f(B, everyone)
+
+		live = np.flatnonzero(np.abs(B - A) > 1e-6)
+		while len(live):
+			A_live = A[live]
+			B_live = B[live]
+			fA_live = fA[live]
+			fB_live = fB[live]
+			C = A_live + (A_live - B_live) * fA_live / (fB_live - fA_live)
+			fC = f(C, live)
+			crossed = fC * fB_live < 0
+			A[live] = np.where(crossed, B_live, A_live)
+			fA[live] = np.where(crossed, fB_live, fA_live / 2)
+			B[live] = C
+			fB[live] = fC
+			live = live[np.abs(C - A[live]) > 1e-6]
+
+		return np.exp(A / 2)
+
+	def record_results(
 		self,
 		matches: Sequence[MatchResult],
-		head_to_head: defaultdict[tuple[str, str], int],
+		head_to_head: defaultdict[tuple[str, str], int] | None,
 		weight_counts: defaultdict[str, Counter[str]],
-	) -> list[tuple[float, float]]:
-		results_by_player: dict[str, list[tuple[Glicko2State, float, float]]] = defaultdict(list)
-		predictions: list[tuple[float, float]] = []
+	) -> None:
+		"""Tally head-to-head results and recent weight classes for a period.
 
+		Pass ``head_to_head=None`` when the pairs are counted separately.
+		"""
 		for match in matches:
 			if match.winner_id not in (match.top_id, match.bottom_id):
 				continue
 
-			self.ensure_player(match.top_id)
-			self.ensure_player(match.bottom_id)
-
 			self._record_weight_class(match.top_id, match.weight_class, weight_counts)
 			self._record_weight_class(match.bottom_id, match.weight_class, weight_counts)
 
-			top_state = self.states[match.top_id]
-			bottom_state = self.states[match.bottom_id]
-			prob_top = self.win_probability(top_state, bottom_state)
-			actual_top = 1.0 if match.winner_id == match.top_id else 0.0
-			predictions.append((prob_top, actual_top))
-
-			weight = self._win_weight(match.win_type)
-			results_by_player[match.top_id].append((bottom_state, actual_top, weight))
-			results_by_player[match.bottom_id].append((top_state, 1.0 - actual_top, weight))
+			if head_to_head is not None:
+				loser = match.bottom_id if match.winner_id == match.top_id else match.top_id
+				head_to_head[(match.winner_id, loser)] += 1
+
+	def apply_period(self, arrays: PeriodArrays) -> np.ndarray:
+		"""Rate one period's matches and return the top wrestlers' expected scores."""
+		self._sync_arrays()
+		n_players = len(self.ids)
+		top = arrays.top
+		bottom = arrays.bottom
+		score = arrays.score
+		weight = arrays.weight
+
+		# Every rating in a period is computed from the states at its start.
+		mu = (self.rating - DEFAULT_RATING) * _INV_SCALE
+		phi = self.rd * _INV_SCALE
+		g = 1.0 / np.sqrt(1.0 + _G_FACTOR * phi * phi)
+		# Gather each side's snapshot once per match; the bottom wrestler's
+		# rating gap is just the negated top gap.
+		g_top = g[top]
+		g_bottom = g[bottom]
+		mu_gap = mu[top] - mu[bottom]
+		expected_top = 1 / (1 + np.exp(-g_bottom * mu_gap))
+		expected_bottom = 1 / (1 + np.exp(g_top * mu_gap))
+
+		v_inv = np.bincount(
+			top, weights=weight * (g_bottom ** 2) * expected_top * (1 - expected_top), minlength=n_players
+		) + np.bincount(
+			bottom, weights=weight * (g_top ** 2) * expected_bottom * (1 - expected_bottom), minlength=n_players
+		)
+		delta_sum = np.bincount(
+			top, weights=weight * g_bottom * (score - expected_top), minlength=n_players
+		) + np.bincount(
+			bottom, weights=weight * g_top * ((1.0 - score) - expected_bottom), minlength=n_players
+		)
 
-			loser = match.bottom_id if match.winner_id == match.top_id else match.top_id
-			head_to_head[(match.winner_id, loser)] += 1
+		phi_star = np.sqrt(phi * phi + self.sigma * self.sigma)
+		new_rd = np.clip(phi_star * SCALE, self.min_rd, self.max_rd)
 
-		new_states: dict[str, Glicko2State] = {}
-		for wrestler_id, state in self.states.items():
-			new_states[wrestler_id] = self._update_player(
-				state,
-				results_by_player.get(wrestler_id, []),
-			)
+		# Players without informative results only have their RD inflated.
+		active = np.flatnonzero(v_inv != 0)
+		if len(active):
+			v = 1.0 / v_inv[active]
+			delta = v * delta_sum[active]
+			phi_star_active = phi_star[active]
+			sigma_prime = self._new_sigmas(self.sigma[active], phi_star_active, v, delta)
+			phi_prime = 1 / np.sqrt(1 / (phi_star_active ** 2 + sigma_prime ** 2) + 1 / v)
+			mu_prime = mu[active] + (phi_prime ** 2) * delta_sum[active]
 
-		self.states = new_states
-		return predictions
+			# mu was computed up front, so only the active rows are rewritten in
+			# place; ratings and volatilities of idle players are untouched.
+			self.rating[active] = DEFAULT_RATING + mu_prime * SCALE
+			new_rd[active] = np.clip(phi_prime * SCALE, self.min_rd, self.max_rd)
+			self.sigma[active] = sigma_prime
+		self.rd = new_rd
+		return expected_top
 
 
 def months_between(first: datetime, second: datetime) -> float:
@@ -328,13 +410,14 @@ def bucket_matches(periods: Sequence[RatingPeriod], matches: Sequence[MatchResul
 	if not periods:
 		return buckets
 
-	period_idx = 0
-	for match in matches:
-		while period_idx < len(periods) and match.date >= periods[period_idx].end:
-			period_idx += 1
-		if period_idx >= len(periods):
-			break
-		if match.date >= periods[period_idx].start:
+	starts = np.array([period.start.timestamp() for period in periods])
+	ends = np.array([period.end.timestamp() for period in periods])
+	dates = np.array([match.date.timestamp() for match in matches])
+	indices = np.searchsorted(starts, dates, side="right") - 1
+	in_period = indices >= 0
+	in_period[in_period] = dates[in_period] < ends[indices[in_period]]
+	for match, period_idx, keep in zip(matches, indices.tolist(), in_period.tolist()):
+		if keep:
 			buckets[period_idx].append(match)
 
 	return buckets
@@ -348,52 +431,180 @@ def run_simulation(
 	season_rd_floor: float | None = SEASON_RD_FLOOR,
 ) -> RatingRunResult:
 	engine = Glicko2(tau=tau, season_rd_floor=season_rd_floor or SEASON_RD_FLOOR)
-	for wrestler_id in wrestlers:
-		engine.ensure_player(wrestler_id)
+	# Ratings and head-to-head counts only see interned row indices; the
+	# string ids are needed just for the weight-class tallies.
+	ids, period_arrays = prepare_period_arrays(matches_by_period, wrestlers, engine.win_type_weights)
 
-	head_to_head: defaultdict[tuple[str, str], int] = defaultdict(int)
 	weight_counts: defaultdict[str, Counter[str]] = defaultdict(Counter)
-	predictions: list[tuple[float, float]] = []
+	for period_matches in matches_by_period:
+		engine.record_results(period_matches, None, weight_counts)
+
+	predictions = _replay_periods(engine, periods, ids, period_arrays, season_rd_floor)
+
+	return RatingRunResult(
+		ratings=engine.states,
+		head_to_head=head_to_head_counts(ids, period_arrays),
+		weight_counts=dict(weight_counts),
+		predictions=predictions,
+		primary_weights=dict(engine.primary_weight),
+	)
+
+
+def prepare_period_arrays(
+	matches_by_period: Sequence[Sequence[MatchResult]],
+	wrestlers: Iterable[str],
+	win_type_weights: Mapping[str, float] = WIN_TYPE_WEIGHTS,
+) -> tuple[list[str], list[PeriodArrays]]:
+	"""Index every period's matches once so simulations can share them.
+
+	Rows are assigned in the same order ``Glicko2.ensure_player`` would assign
+	them; the returned ids list maps rows back to wrestler ids.
+	"""
+	index: dict[str, int] = {}
+	ids: list[str] = []
+
+	def row(wrestler_id: str) -> int:
+		idx = index.get(wrestler_id)
+		if idx is None:
+			idx = index[wrestler_id] = len(ids)
+			ids.append(wrestler_id)
+		return idx
+
+	for wrestler_id in wrestlers:
+		row(wrestler_id)
+
+	period_arrays: list[PeriodArrays] = []
+	for period_matches in matches_by_period:
+		n_known = len(ids)
+		top_rows: list[int] = []
+		bottom_rows: list[int] = []
+		top_scores: list[float] = []
+		weights: list[float] = []
+		for match in period_matches:
+			if match.winner_id not in (match.top_id, match.bottom_id):
+				continue
+			top_rows.append(row(match.top_id))
+			bottom_rows.append(row(match.bottom_id))
+			top_scores.append(1.0 if match.winner_id == match.top_id else 0.0)
+			weights.append(_win_weight(match.win_type, win_type_weights))
+		period_arrays.append(
+			PeriodArrays(
+				top=np.array(top_rows, dtype=np.intp),
+				bottom=np.array(bottom_rows, dtype=np.intp),
+				score=np.array(top_scores),
+				weight=np.array(weights),
+				n_known=n_known,
+				n_players=len(ids),
+			)
+		)
+	return ids, period_arrays
+
+
+def head_to_head_counts(ids: Sequence[str], period_arrays: Sequence[PeriodArrays]) -> dict[tuple[str, str], int]:
+	"""Count wins per (winner, loser) pair from the prepared period arrays.
+
+	Each pair is packed into one int64 key, ``winner_row << 32 | loser_row``, so
+	the counting is a single ``np.unique`` instead of a tuple hash per match.
+	"""
+	if not period_arrays:
+		return {}
+	top = np.concatenate([arrays.top for arrays in period_arrays]).astype(np.int64)
+	bottom = np.concatenate([arrays.bottom for arrays in period_arrays]).astype(np.int64)
+	top_won = np.concatenate([arrays.score for arrays in period_arrays]) == 1.0
+	winners = np.where(top_won, top, bottom)
+	losers = np.where(top_won, bottom, top)
+	keys, counts = np.unique((winners << 32) | losers, return_counts=True)
+	return {(ids[key >> 32], ids[key & 0xFFFFFFFF]): count for key, count in zip(keys.tolist(), counts.tolist())}
+
+
+def run_with_arrays(
+	periods: Sequence[RatingPeriod],
+	ids: Sequence[str],
+	period_arrays: Sequence[PeriodArrays],
+	tau: float,
+	season_rd_floor: float | None = SEASON_RD_FLOOR,
+) -> np.ndarray:
+	"""Replay prepared periods for one tau and return only the predictions."""
+	engine = Glicko2(tau=tau, season_rd_floor=season_rd_floor or SEASON_RD_FLOOR)
+	return _replay_periods(engine, periods, ids, period_arrays, season_rd_floor)
+
+
+def _replay_periods(
+	engine: Glicko2,
+	periods: Sequence[RatingPeriod],
+	ids: Sequence[str],
+	period_arrays: Sequence[PeriodArrays],
+	season_rd_floor: float | None,
+) -> np.ndarray:
+	total = sum(len(arrays.top) for _, arrays in zip(periods, period_arrays))
+	predictions = np.empty((total, 2), dtype=np.float64)
+	filled = 0
 
 	prev_end: datetime | None = None
 	prev_season: str | None = None
-	for period, period_matches in zip(periods, matches_by_period):
+	for period, arrays in zip(periods, period_arrays):
+		# Register the wrestlers seen before this period first, so the gap
+		# and season adjustments only touch them.
+		for wrestler_id in ids[len(engine.ids):arrays.n_known]:
+			engine.ensure_player(wrestler_id)
 		if prev_end is not None:
 			engine.inflate_for_gap(months_between(prev_end, period.start))
 		if season_rd_floor is not None and period.season != prev_season:
 			engine.reset_rd_for_season()
 			prev_season = period.season
-		predictions.extend(engine.process_period(period_matches, head_to_head, weight_counts))
+		for wrestler_id in ids[len(engine.ids):arrays.n_players]:
+			engine.ensure_player(wrestler_id)
+		expected_top = engine.apply_period(arrays)
+		end = filled + len(expected_top)
+		predictions[filled:end, 0] = expected_top
+		predictions[filled:end, 1] = arrays.score
+		filled = end
 		prev_end = period.end
 
-	return RatingRunResult(
-		ratings=engine.states,
-		head_to_head=dict(head_to_head),
-		weight_counts=dict(weight_counts),
-		predictions=predictions,
-	)
+	return predictions
 
 
-def evaluate_predictions(predictions: Sequence[tuple[float, float]]) -> tuple[float, float]:
-	if not predictions:
+def evaluate_predictions(predictions: np.ndarray | Sequence[tuple[float, float]]) -> tuple[float, float]:
+	if not len(predictions):
 		return 0.0, 0.0
-	brier = sum((p - actual) ** 2 for p, actual in predictions) / len(predictions)
-	accuracy = sum((p >= 0.5 and actual == 1.0) or (p < 0.5 and actual == 0.0) for p, actual in predictions) / len(predictions)
+	pairs = np.asarray(predictions, dtype=np.float64)
+	probs = pairs[:, 0]
+	actuals = pairs[:, 1]
+	brier = float(np.mean((probs - actuals) ** 2))
+	accuracy = float(np.mean(np.where(probs >= 0.5, actuals == 1.0, actuals == 0.0)))
 	return brier, accuracy
 
 
+def _score_tau(
+	periods: Sequence[RatingPeriod],
+	ids: Sequence[str],
+	period_arrays: Sequence[PeriodArrays],
+	tau: float,
+) -> tuple[float, float]:
+	return evaluate_predictions(run_with_arrays(periods, ids, period_arrays, tau))
+
+
 def tune_tau(
 	periods: Sequence[RatingPeriod],
 	matches_by_period: Sequence[Sequence[MatchResult]],
 	wrestlers: Iterable[str],
 	candidates: Sequence[float],
+	workers: int | None = None,
 ) -> tuple[float, tuple[float, float]]:
+	"""Back-test each tau candidate, running candidates in separate processes."""
 	best_tau = candidates[0]
 	best_metric = (float("inf"), 0.0)  # (brier, accuracy)
+	ids, period_arrays = prepare_period_arrays(matches_by_period, wrestlers)
+	score = partial(_score_tau, periods, ids, period_arrays)
 
-	for tau in candidates:
-		result = run_simulation(periods, matches_by_period, wrestlers, tau)
-		metrics = evaluate_predictions(result.predictions)
+	workers = min(len(candidates), workers or os.cpu_count() or 1)
+	if workers > 1:
+		with ProcessPoolExecutor(max_workers=workers) as executor:
+			all_metrics = list(executor.map(score, candidates))
+	else:
+		all_metrics = [score(tau) for tau in candidates]
+
+	for tau, metrics in zip(candidates, all_metrics):
 		if metrics[0] < best_metric[0]:
 			best_tau = tau
 			best_metric = metrics
@@ -442,6 +653,12 @@ def parse_args() -> argparse.Namespace:
 		"--tau-candidates",
 		help="Comma-separated tau candidates to back-test.",
 	)
+	parser.add_argument(
+		"--tau-workers",
+		type=int,
+		default=None,
+		help="Processes used to back-test tau candidates. Defaults to one per CPU.",
+	)
 	parser.add_argument(
 		"--grad-year",
 		type=int,
@@ -531,8 +748,8 @@ def build_matches(
 
 
 def tally_records(matches: Sequence[MatchResult]) -> tuple[Counter[str], Counter[str]]:
-	wins: Counter[str] = Counter()
-	losses: Counter[str] = Counter()
+	winners: list[str] = []
+	losers: list[str] = []
 	for match in matches:
 		winner = match.winner_id
 		if winner not in (match.top_id, match.bottom_id):
@@ -540,18 +757,22 @@ def tally_records(matches: Sequence[MatchResult]) -> tuple[Counter[str], Counter
 		loser = match.bottom_id if winner == match.top_id else match.top_id
 		if loser is None:
 			continue
-		wins[winner] += 1
-		losses[loser] += 1
-	return wins, losses
+		winners.append(winner)
+		losers.append(loser)
+	# Counter's constructor counts a whole list in C.
+	return Counter(winners), Counter(losers)
 
 
 def primary_weight_class(
 	weight_counts: Mapping[str, Counter[str]],
 	wrestler_id: str,
 	overrides: Mapping[str, str] | None = None,
+	primary_weights: Mapping[str, str] | None = None,
 ) -> str | None:
 	if overrides and wrestler_id in overrides:
 		return overrides[wrestler_id]
+	if primary_weights is not None:
+		return primary_weights.get(wrestler_id)
 	counter = weight_counts.get(wrestler_id)
 	if not counter:
 		return None
@@ -587,14 +808,31 @@ def build_leaderboard(
 			return -1 if h2h > 0 else 1
 		return 0
 
+	# Results built by run_simulation carry the primary weights tracked
+	# during the run; otherwise fall back to the weight counters.
+	primary_weights = result.primary_weights or None
+	by_weight: defaultdict[str | None, list[str]] = defaultdict(list)
+	for wrestler_id in result.ratings.keys():
+		if wrestler_id in allowed_ids:
+			by_weight[primary_weight_class(result.weight_counts, wrestler_id, weight_overrides, primary_weights)].append(
+				wrestler_id
+			)
+
 	for weight in weight_classes:
-		candidates = [
-			wrestler_id
-			for wrestler_id in result.ratings.keys()
-			if wrestler_id in allowed_ids
-			if primary_weight_class(result.weight_counts, wrestler_id, weight_overrides) == weight
-		]
-		candidates.sort(key=cmp_to_key(cmp))
+		candidates = list(by_weight.get(weight, ()))
+		candidates.sort(key=lambda wrestler_id: -result.ratings[wrestler_id].rating)
+		# Only ratings within 1e-6 of each other need the head-to-head comparator.
+		start = 0
+		while start < len(candidates):
+			end = start + 1
+			while (
+				end < len(candidates)
+				and result.ratings[candidates[end - 1]].rating - result.ratings[candidates[end]].rating <= 1e-6
+			):
+				end += 1
+			if end - start > 1:
+				candidates[start:end] = sorted(candidates[start:end], key=cmp_to_key(cmp))
+			start = end
 
 		ranking: list[str] = []
 		for wrestler_id in candidates if limit is None else candidates[:limit]:
@@ -735,7 +973,9 @@ def main() -> None:
 	chosen_tau = args.tau
 	metrics = (0.0, 0.0)
 	if chosen_tau is None:
-		chosen_tau, metrics = tune_tau(periods, matches_by_period, active_wrestlers, candidates)
+		chosen_tau, metrics = tune_tau(
+			periods, matches_by_period, active_wrestlers, candidates, workers=args.tau_workers
+		)
 		print(f"Tuned tau to {chosen_tau:.3f} (Brier={metrics[0]:.4f}, accuracy={metrics[1]:.2%})")
 	else:
 		print(f"Using provided tau={chosen_tau:.3f}")
@@ -845,7 +1085,7 @@ def main() -> None:
 			"wrestlers": wrestlers_payload,
 		}
 		args.json_out.parent.mkdir(parents=True, exist_ok=True)
-		args.json_out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+		args.json_out.write_bytes(utils.json_dumps(payload, indent=True))
 		print(f"Wrote leaderboard JSON to {args.json_out}")
 		return
 
@@ -8,7 +8,8 @@ CREATE TABLE IF NOT EXISTS events (
     name TEXT,
     isDual INTEGER,
     lat REAL,
-    lon REAL
+    lon REAL,
+    is_postseason INTEGER DEFAULT 0
 );
 
 CREATE TABLE IF NOT EXISTS teams (
@@ -42,4 +43,16 @@ CREATE TABLE IF NOT EXISTS matches (
     FOREIGN KEY (bottomId) REFERENCES wrestlers(id),
     FOREIGN KEY (winnerId) REFERENCES wrestlers(id),
     FOREIGN KEY (eventId) REFERENCES events(id)
-);
\ No newline at end of file
+);
+
+CREATE INDEX IF NOT EXISTS idx_matches_eventId ON matches(eventId);
+
+CREATE INDEX IF NOT EXISTS idx_matches_date_null ON matches(eventId) WHERE date IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_matches_winner_date ON matches(winnerId, date);
+
+CREATE INDEX IF NOT EXISTS idx_wrestlers_team_grad ON wrestlers(teamId, gradYear);
+
+CREATE INDEX IF NOT EXISTS idx_matches_topId ON matches(topId);
+
+CREATE INDEX IF NOT EXISTS idx_matches_bottomId ON matches(bottomId);
@@ -1,15 +1,71 @@
 import api_types
 import json
 import calendar
-from datetime import datetime, timezone, timedelta
-from typing import Iterable, Iterator, Tuple
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Tuple
+
+try:
+	import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+	orjson = None  # type: ignore
 
 import db
 
+_tls = threading.local()
+
+def _cursor() -> sqlite3.Cursor:
+	"""Return this thread's read cursor, opening its own connection on first use."""
+	cur = getattr(_tls, "cur", None)
+	if cur is None:
+		# A private connection rather than one taken from db's pool: it is
+		# kept for the thread's lifetime and switched to autocommit, so
+		# filling the temp id tables never leaves a transaction (and a
+		# stale read snapshot) open on it.
+		conn = db._open_connection(shared=False)
+		conn.isolation_level = None
+		_tls.conn = conn
+		cur = _tls.cur = conn.cursor()
+	return cur
+
+def _load_temp_ids(cur: sqlite3.Cursor, ids: Iterable[str]) -> None:
+	"""Replace the contents of this connection's ``temp.ids`` table with ``ids``.
+
+	Queries filter with ``IN (SELECT id FROM temp.ids)`` so their SQL text stays
+	the same however many ids there are, and long lists never hit SQLite's
+	bound-parameter limit.
+	"""
+	cur.execute("CREATE TEMP TABLE IF NOT EXISTS ids (id TEXT PRIMARY KEY)")
+	cur.execute("DELETE FROM temp.ids")
+	cur.executemany("INSERT OR IGNORE INTO temp.ids (id) VALUES (?)", ((i,) for i in ids))
+
+def json_loads(raw: bytes | str) -> Any:
+	"""Decode JSON with orjson when it is installed, else the stdlib."""
+	if orjson is not None:
+		return orjson.loads(raw)
+	return json.loads(raw)
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+	"""Encode JSON to UTF-8 bytes with orjson when it is installed, else the stdlib.
+
+	The stdlib fallback is configured to produce orjson's layout: non-ASCII
+	text left unescaped and no spaces in compact output. orjson writes NaN
+	and infinities as null where the stdlib writes NaN/Infinity.
+	"""
+	if orjson is not None:
+		option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+		return orjson.dumps(obj, option=option)
+	if indent:
+		return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+	return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 def next_link(data: api_types.GenericResponse, current_url: str) -> str | None:
 	if "links" in data and "next" in data["links"]:
 		next_url = data["links"]["next"]
-		if next_url is not current_url:
+		if next_url and next_url != current_url:
 			return next_url
 	return None
 
@@ -19,12 +75,14 @@ def get_school_year(date: datetime) -> int:
 	else:
 		return date.year - 1
 
-def calc_cur_grade(past_grade: int, past_date: str, cur_date: datetime) -> int | None:
-	past_school_year = 0
+@lru_cache(maxsize=4096)
+def _school_year_of(timestamp: str) -> int:
+	# Bouts of one event share a start time, so most lookups are cache hits.
+	d = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+	return get_school_year(d)
 
-	d = datetime.strptime(past_date, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
-		
-	past_school_year = get_school_year(d)
+def calc_cur_grade(past_grade: int, past_date: str, cur_date: datetime) -> int | None:
+	past_school_year = _school_year_of(past_date)
 	cur_school_year = get_school_year(cur_date)
 	return past_grade + cur_school_year - past_school_year
 
@@ -33,9 +91,29 @@ def calc_grad_year(grade: int, as_of: datetime) -> int:
 	years_left = 12 - grade
 	return school_year + years_left + 1
 
+ALIGNMENT_PATH = "./alignments/miaa.json"
+
+_alignment_cache: dict | None = None
+_team_index: dict[str, Tuple[str | None, int | None]] | None = None
+
+def _load_alignment() -> dict:
+	"""Parse the alignment file once and index every team's (section, division)."""
+	global _alignment_cache, _team_index
+	if _alignment_cache is None:
+		with open(ALIGNMENT_PATH, "r", encoding="utf-8") as f:
+			data = json.load(f)
+		team_index: dict[str, Tuple[str | None, int | None]] = {}
+		for d in data.get("divisions", []):
+			for s in d.get("sections", []):
+				for team_id in s.get("teams", []) or []:
+					# The first section listing a team wins, as in a linear scan.
+					team_index.setdefault(team_id, (s.get("name"), d.get("division")))
+		_team_index = team_index
+		_alignment_cache = data
+	return _alignment_cache
+
 def get_divisions() -> list[int]:
-	with open("./alignments/miaa.json", "r", encoding="utf-8") as f:
-		data = json.load(f)
+	data = _load_alignment()
 
 	divisions = []
 
@@ -45,8 +123,7 @@ def get_divisions() -> list[int]:
 	return divisions
 
 def get_sections(division: int | None = None) -> list[str]:
-	with open("./alignments/miaa.json", "r", encoding="utf-8") as f:
-		data = json.load(f)
+	data = _load_alignment()
 
 	sections = []
 
@@ -60,8 +137,7 @@ def get_sections(division: int | None = None) -> list[str]:
 	return sections
 
 def get_team_ids(division: int | None = None, section: str | None = None) -> list[str]:
-	with open("./alignments/miaa.json", "r", encoding="utf-8") as f:
-		data = json.load(f)
+	data = _load_alignment()
 
 	teams = []
 
@@ -80,16 +156,8 @@ def get_team_ids(division: int | None = None, section: str | None = None) -> lis
 
 def get_team_section(team_id: str) -> Tuple[str | None, int | None]:
 	"""Return (section, division) for a team id using alignment data."""
-	with open("./alignments/miaa.json", "r", encoding="utf-8") as f:
-		data = json.load(f)
-
-	for d in data.get("divisions", []):
-		division_num = d.get("division")
-		for s in d.get("sections", []):
-			section_name = s.get("name")  # type: ignore
-			if team_id in (s.get("teams", []) or []):  # type: ignore
-				return section_name, division_num
-	return None, None
+	_load_alignment()
+	return _team_index.get(team_id, (None, None))  # type: ignore[union-attr]
 
 
 def get_team_metadata(team_ids: Iterable[str]) -> dict[str, dict]:
@@ -98,39 +166,38 @@ def get_team_metadata(team_ids: Iterable[str]) -> dict[str, dict]:
 	if not ids:
 		return {}
 
-	conn = db.get_connection()
-	cur = conn.cursor()
-	placeholders = ",".join("?" for _ in ids)
-	sql = f"SELECT id, name FROM teams WHERE id IN ({placeholders})"
-	cur.execute(sql, ids)
-	results: dict[str, dict] = {}
-	for team_id, name in cur.fetchall():
-		section, division = get_team_section(team_id)
-		results[team_id] = {"name": name, "section": section, "division": division}
+	cur = _cursor()
+	_load_temp_ids(cur, ids)
+	sql = "SELECT id, name FROM teams WHERE id IN (SELECT id FROM temp.ids)"
+	cur.execute(sql)
+	_load_alignment()
+	team_index = _team_index or {}
+	results: dict[str, dict] = {
+		team_id: {"name": name, "section": section, "division": division}
+		for team_id, name in cur.fetchall()
+		for section, division in (team_index.get(team_id, (None, None)),)
+	}
 	# Fill section/division for any missing names using alignment data.
 	for team_id in ids:
-		if team_id in results:
-			continue
-		section, division = get_team_section(team_id)
-		results[team_id] = {"name": team_id, "section": section, "division": division}
+		if team_id not in results:
+			section, division = team_index.get(team_id, (None, None))
+			results[team_id] = {"name": team_id, "section": section, "division": division}
 	return results
 
 def get_section(team_id: str) -> dict[str, str] | None:
 	# return team's section and division
-	with open("./alignments/miaa.json", "r", encoding="utf-8") as f:
-		data = json.load(f)
-	for d in data.get("divisions", []):
-		for s in d.get("sections", []):
-			if team_id in s.get("teams", []): # type: ignore
-				return {
-					"division": d.get("division"),
-					"section": s.get("name"),
-				}
-	return None
+	_load_alignment()
+	entry = _team_index.get(team_id)  # type: ignore[union-attr]
+	if entry is None:
+		return None
+	section, division = entry
+	return {
+		"division": division,
+		"section": section,
+	}
 
 def get_wrestler_matches(wrestler_id: str) -> list[dict]:
-	conn = db.get_connection()
-	cur = conn.cursor()
+	cur = _cursor()
 
 	sql = """
 SELECT
@@ -151,85 +218,83 @@ LEFT JOIN events AS e ON e.id = m.eventId
 LEFT JOIN wrestlers AS top_w ON top_w.id = m.topId
 LEFT JOIN wrestlers AS bottom_w ON bottom_w.id = m.bottomId
 WHERE m.topId = ? OR m.bottomId = ?
-ORDER BY (match_date IS NULL), match_date DESC;
+ORDER BY match_date DESC NULLS LAST;
 	"""
 	cur.execute(sql, (wrestler_id, wrestler_id))
-	rows = cur.fetchall()
 	matches = []
 
-	for (
-		match_id,
-		event_id,
-		date,
-		weight_class,
-		top_id,
-		bottom_id,
-		winner_id,
-		result,
-		win_type,
-		event_name,
-		top_name,
-		bottom_name,
-	) in rows:
-		opponent_name = bottom_name if top_id == wrestler_id else top_name
-		opponent_id = bottom_id if top_id == wrestler_id else top_id
+	# The pooled connection returns sqlite3.Row, so columns are read by name.
+	for row in cur:
+		top_is_self = row["topId"] == wrestler_id
 		matches.append({
-			"type": "win" if winner_id == wrestler_id else "loss",
-			"id": match_id,
-			"date": date,
-			"weightClass": weight_class,
+			"type": "win" if row["winnerId"] == wrestler_id else "loss",
+			"id": row["id"],
+			"date": row["match_date"],
+			"weightClass": row["weightClass"],
 			"opponent": {
-				"id": opponent_id,
-				"name": opponent_name,
+				"id": row["bottomId"] if top_is_self else row["topId"],
+				"name": row["bottom_name"] if top_is_self else row["top_name"],
 			},
-			"result": result,
-			"winType": win_type,
+			"result": row["result"],
+			"winType": row["winType"],
 			"event": {
-				"id": event_id,
-				"name": event_name,
+				"id": row["eventId"],
+				"name": row["event_name"],
 			},
 		})
 	return matches
 
 
+@lru_cache(maxsize=1)
+def _one_year_ago_iso(day: int) -> str:
+	"""Return the activity cutoff for UTC day ordinal ``day``: midnight one year earlier."""
+	one_year_ago = datetime.fromordinal(day - 365).replace(tzinfo=timezone.utc)
+	return one_year_ago.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
 def get_active_wrestlers(min_wins: int = 1) -> list[str]:
 	teams = get_team_ids()
 	
 	if not teams:
 		return []
 
-	conn = db.get_connection()
-	cur = conn.cursor()
+	cur = _cursor()
 
-	# Calculate date 1 year ago
-	one_year_ago = datetime.now(timezone.utc) - timedelta(days=365)
-	date_str = one_year_ago.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+	date_str = _one_year_ago_iso(datetime.now(timezone.utc).date().toordinal())
 
-	placeholders = ",".join("?" for _ in teams)
-	sql = f"""
+	_load_temp_ids(cur, teams)
+	params: list = [date_str]
+
+	if min_wins <= 1:
+		# One recent win is enough, so probe idx_matches_winner_date for it
+		# instead of counting every win.
+		sql = """
+		SELECT w.id
+		FROM wrestlers w
+		WHERE w.teamId IN (SELECT id FROM temp.ids)
+		AND (w.gradYear IS NULL OR w.gradYear >= 2026)
+		AND EXISTS (SELECT 1 FROM matches m WHERE m.winnerId = w.id AND m.date >= ?)
+		ORDER BY w.id
+	"""
+	else:
+		sql = """
 		SELECT w.id
 		FROM wrestlers w
 		JOIN matches m ON w.id = m.winnerId
-		WHERE w.teamId IN ({placeholders})
+		WHERE w.teamId IN (SELECT id FROM temp.ids)
 		AND (w.gradYear IS NULL OR w.gradYear >= 2026)
 		AND m.date >= ?
 		GROUP BY w.id
 		HAVING COUNT(m.id) >= ?
 	"""
-
-	params = list(teams)
-	params.append(date_str)
-	params.append(min_wins) # type: ignore
+		params.append(min_wins) # type: ignore
 	
 	cur.execute(sql, params)
-	rows = cur.fetchall()
 	
-	return [row[0] for row in rows]
+	return [row[0] for row in cur]
 	
 
 def get_team_lineup(team_id: str, event_id: str) -> dict[str, tuple[str, str]]:
-	conn = db.get_connection()
-	cur = conn.cursor()
+	cur = _cursor()
 
 	sql = """
 SELECT DISTINCT
@@ -240,17 +305,17 @@ FROM matches AS m
 JOIN wrestlers AS w
   ON (m.topId = w.id OR m.bottomId = w.id)
 WHERE m.eventId = ?
-  AND w.teamId = ?;
+  AND w.teamId = ?
+ORDER BY weight_class;
 	"""
 	cur.execute(sql, (event_id, team_id))
-	rows = cur.fetchall()
 
 	lineup: dict[str, tuple[str, str]] = {}
-	# sort by weight class
-	for wrestler_id, wrestler_name, weight_class in rows:
+	# rows arrive sorted by weight class
+	for wrestler_id, wrestler_name, weight_class in cur:
 		lineup[weight_class] = (wrestler_id, wrestler_name)
 	
-	return dict(sorted(lineup.items()))
+	return lineup
 
 
 def parse_date(date_str: str) -> datetime:
@@ -301,19 +366,20 @@ def get_matches_between(
 	if not ids:
 		return []
 
-	conn = db.get_connection()
-	cur = conn.cursor()
+	cur = _cursor()
 
 	date_start = start.astimezone(timezone.utc).isoformat()
 	date_end = end.astimezone(timezone.utc).isoformat()
 
-	id_placeholders = ",".join("?" for _ in ids)
+	_load_temp_ids(cur, ids)
 	weight_clause = ""
-	params: list = [date_start, date_end, *ids, *ids]
+	params: list = [date_start, date_end]
 
 	if weight_classes:
-		weight_clause = f" AND m.weightClass IN ({','.join('?' for _ in weight_classes)})"
-		params.extend(weight_classes)  # type: ignore[arg-type]
+		# One JSON array parameter keeps the statement text fixed however many
+		# weights are passed, so sqlite3's statement cache can reuse it.
+		weight_clause = " AND m.weightClass IN (SELECT value FROM json_each(?))"
+		params.append(json.dumps(list(weight_classes)))
 
 	sql = f"""
 SELECT
@@ -330,14 +396,18 @@ LEFT JOIN events AS e ON e.id = m.eventId
 WHERE match_date IS NOT NULL
   AND match_date >= ?
   AND match_date < ?
-  AND m.topId IN ({id_placeholders})
-  AND m.bottomId IN ({id_placeholders})
+  AND m.topId IN (SELECT id FROM temp.ids)
+  AND m.bottomId IN (SELECT id FROM temp.ids)
   {weight_clause}
 ORDER BY match_date ASC;
 	"""
 	cur.execute(sql, params)
 
 	matches = []
+	# Rows come back sorted by date and bouts of one event often share a start
+	# time, so only parse when the raw string changes from the previous row.
+	last_raw: str | None = None
+	last_date: datetime | None = None
 	for (
 		match_id,
 		match_date,
@@ -347,11 +417,13 @@ ORDER BY match_date ASC;
 		winner_id,
 		result,
 		win_type,
-	) in cur.fetchall():
+	) in cur:
+		if match_date != last_raw:
+			last_raw, last_date = match_date, parse_date(match_date)
 		matches.append(
 			{
 				"id": match_id,
-				"date": parse_date(match_date),
+				"date": last_date,
 				"weightClass": weight_class,
 				"topId": top_id,
 				"bottomId": bottom_id,
@@ -365,31 +437,41 @@ ORDER BY match_date ASC;
 
 def get_wrestler_names(wrestler_ids: Iterable[str]) -> dict[str, str]:
 	"""Return a mapping of wrestler IDs to their stored names."""
-	ids = list(wrestler_ids)
-	if not ids:
-		return {}
+	return {wrestler_id: meta["name"] for wrestler_id, meta in get_wrestler_info(wrestler_ids).items()}
 
-	conn = db.get_connection()
-	cur = conn.cursor()
-
-	placeholders = ",".join("?" for _ in ids)
-	sql = f"SELECT id, COALESCE(name, id) FROM wrestlers WHERE id IN ({placeholders})"
-	cur.execute(sql, ids)
-
-	return {row[0]: row[1] for row in cur.fetchall()}
 
+# Wrestler metadata keyed by id, least recently used first; filled by
+# get_wrestler_info, capped at WRESTLER_INFO_CACHE_SIZE entries and emptied
+# by invalidate_caches.
+WRESTLER_INFO_CACHE_SIZE = 16384
+_wrestler_info_cache: "OrderedDict[str, dict]" = OrderedDict()
+_wrestler_info_lock = threading.Lock()
 
 def get_wrestler_info(wrestler_ids: Iterable[str]) -> dict[str, dict]:
-	"""Return a mapping of wrestler IDs to metadata such as name, gradYear, teamId."""
+	"""Return a mapping of wrestler IDs to metadata such as name, gradYear, teamId.
+
+	Recently used rows are cached per id, so only ids not seen lately are queried.
+	"""
 	ids = list(wrestler_ids)
 	if not ids:
 		return {}
 
-	conn = db.get_connection()
-	cur = conn.cursor()
-
-	placeholders = ",".join("?" for _ in ids)
-	sql = f"""
+	found: dict[str, dict] = {}
+	missing = []
+	with _wrestler_info_lock:
+		for wrestler_id in dict.fromkeys(ids):
+			info = _wrestler_info_cache.get(wrestler_id)
+			if info is None:
+				missing.append(wrestler_id)
+			else:
+				_wrestler_info_cache.move_to_end(wrestler_id)
+				found[wrestler_id] = info
+
+	if missing:
+		cur = _cursor()
+
+		_load_temp_ids(cur, missing)
+		sql = """
 SELECT w.id,
        COALESCE(w.name, w.id) AS name,
        w.gradYear,
@@ -397,28 +479,47 @@ SELECT w.id,
        t.name as teamName
 FROM wrestlers w
 LEFT JOIN teams t ON t.id = w.teamId
-WHERE w.id IN ({placeholders})
+WHERE w.id IN (SELECT id FROM temp.ids)
 """
-	cur.execute(sql, ids)
-
-	info: dict[str, dict] = {}
-	for wrestler_id, name, grad_year, team_id, team_name in cur.fetchall():
-		section, division = get_team_section(team_id) if team_id else (None, None)
-		info[wrestler_id] = {
-			"name": name,
-			"gradYear": grad_year,
-			"teamId": team_id,
-			"teamName": team_name,
-			"section": section,
-			"division": division,
-		}
-	return info
+		cur.execute(sql)
+
+		fetched: dict[str, dict] = {}
+		for wrestler_id, name, grad_year, team_id, team_name in cur:
+			section, division = get_team_section(team_id) if team_id else (None, None)
+			fetched[wrestler_id] = {
+				"name": name,
+				"gradYear": grad_year,
+				"teamId": team_id,
+				"teamName": team_name,
+				"section": section,
+				"division": division,
+			}
+
+		with _wrestler_info_lock:
+			for wrestler_id, info in fetched.items():
+				_wrestler_info_cache[wrestler_id] = info
+				_wrestler_info_cache.move_to_end(wrestler_id)
+			while len(_wrestler_info_cache) > WRESTLER_INFO_CACHE_SIZE:
+				_wrestler_info_cache.popitem(last=False)
+		found.update(fetched)
+
+	# Hand out copies so callers cannot edit the cached rows.
+	return {
+		wrestler_id: dict(found[wrestler_id])
+		for wrestler_id in ids
+		if wrestler_id in found
+	}
+
+
+def invalidate_caches() -> None:
+	"""Drop cached wrestler metadata after wrestlers are updated."""
+	with _wrestler_info_lock:
+		_wrestler_info_cache.clear()
 
 #return all post season events a wrestler participated in each year
 def get_post_participation(wrestler_id: str) -> dict[int, list[dict]]:
-	# find all events with the word "MIAA" in the name of the event (no other search criteria)
-	conn = db.get_connection()
-	cur = conn.cursor()
+	# postseason events are the ones with "MIAA" in the name, flagged as is_postseason when stored
+	cur = _cursor()
 	sql = """
 SELECT DISTINCT
   e.id,
@@ -427,7 +528,7 @@ SELECT DISTINCT
 FROM events AS e
 JOIN matches AS m ON m.eventId = e.id
 WHERE (m.topId = ? OR m.bottomId = ?)
-  AND e.name LIKE '%MIAA%'
+  AND e.is_postseason = 1
 ORDER BY e.date ASC;
 	"""
 	cur.execute(sql, (wrestler_id, wrestler_id))
@@ -449,8 +550,19 @@ ORDER BY e.date ASC;
 
 def infer_grad_year_from_post(wrestler_id: str) -> int | None:
 	"""Infer minimum gradYear from earliest postseason appearance."""
-	participation = get_post_participation(wrestler_id)
-	if not participation:
+	cur = _cursor()
+	# School years only grow with the date, so the earliest event date gives
+	# the earliest school year without loading every appearance.
+	sql = """
+SELECT MIN(e.date)
+FROM events AS e
+JOIN matches AS m ON m.eventId = e.id
+WHERE (m.topId = ? OR m.bottomId = ?)
+  AND e.is_postseason = 1;
+	"""
+	cur.execute(sql, (wrestler_id, wrestler_id))
+	(earliest_date,) = cur.fetchone()
+	if earliest_date is None:
 		return None
-	earliest_school_year = min(participation.keys())
+	earliest_school_year = get_school_year(parse_date(earliest_date))
 	return earliest_school_year + 4